@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import pygame
+from src.engine.bots import GreedyBot, Autopilot
+from src.engine.game_engine import GameEngine, BONUS_KINDS
+from src.engine.pathfinding import DistanceField
+from src.engine.spawner import SPAWN
+
+SNAKE_LENGTHS = (3, 300, 3000)
+FILL_RATIOS = (0.1, 0.5, 0.9, 0.99)
+BONUS_COUNTS = (10, 100, 1000)
+SNAKE_COUNTS = (1, 8, 64)
+RESOLUTIONS = ((800, 600), (1280, 720), (1920, 1080))
+BOARD_SIZES = ((32, 24), (500, 500), (2000, 2000))
+FIELD_BOARDS = ((64, 48), (500, 500))
+ENV_COUNTS = (1, 256, 4096)
+# Замеры идут без окна и звука, если драйверы SDL не заданы явно
+HEADLESS_ENV = {"SDL_VIDEODRIVER": "dummy", "SDL_AUDIODRIVER": "dummy"}
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import pygame
+pygame.display.init()
+pygame.font.init()
+screen = pygame.display.set_mode((800, 600))
+from src.game import assets
+from src.ui.main_menu import MainMenu
+assets.prefetch()
+MainMenu(800, 600).render(screen)
+pygame.display.flip()
+print(time.perf_counter() - start)
+"""
+
+
+def measure(func, number, repeat=5):
+    # Лучшее время одного вызова из нескольких серий, в секундах
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def serpentine(cols, rows, length):
+    # Тело змейки змейкой по строкам: голова последней клеткой пути
+    path = []
+    for row in range(rows):
+        columns = range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)
+        path.extend((col, row) for col in columns)
+    body = list(reversed(path[:length]))
+    head, neck = path[length - 1], path[length - 2]
+    if head[1] != neck[1]:
+        direction = "DOWN"
+    else:
+        direction = "RIGHT" if head[0] > neck[0] else "LEFT"
+    return body, direction
+
+
+def make_engine(cols, rows, snake_length, bonus_settings=None):
+    body, direction = serpentine(cols, rows, snake_length)
+    return GameEngine(cols, rows, border_mode=False, seed=1, bonus_settings=bonus_settings,
+                      body=body, direction=direction)
+
+
+def unlimited_settings():
+    return {kind: {"max_count": 10 ** 9, "lifetime": 10 ** 9, "spawn_interval": 10 ** 9} for kind in BONUS_KINDS}
+
+
+def bench_snake(results):
+    from src.game.snake import Snake
+    for length in SNAKE_LENGTHS:
+        engine = make_engine(80, 60, length)
+        snake = Snake(25, engine.snake)
+        results[f"snake.move[len={length}]"] = measure(lambda: snake.move(border_mode=False), 2000)
+
+        def step_and_update():
+            # Без нового хода update_sprites ничего не делает, поэтому модель сдвигается на шаг
+            snake.model.move(False)
+            snake.update_sprites()
+
+        results[f"snake.update_sprites[len={length}]"] = measure(step_and_update, 2000)
+        results[f"snake.rebuild_sprites[len={length}]"] = measure(snake.rebuild_sprites, 20)
+        results[f"snake.check_self_collision[len={length}]"] = measure(snake.check_self_collision, 20000)
+
+
+def bench_spawn(results):
+    # Очередь событий и список событий шага возвращаются к исходным на каждой итерации,
+    # иначе куча растёт и поздние замеры меряют уже другую очередь
+    cols, rows = 80, 60
+    for ratio in FILL_RATIOS:
+        engine = make_engine(cols, rows, max(3, int(cols * rows * ratio)), unlimited_settings())
+        spawner = engine.spawner
+        initial_queue = list(spawner.queue)
+        engine.time = 1.0
+
+        def spawn_and_remove():
+            spawner.queue[:] = initial_queue
+            engine.events = []
+            bonus = engine.spawn_bonus("bomb")
+            engine.remove_bonus(bonus, "expire")
+
+        results[f"engine.spawn_bonus[fill={ratio}]"] = measure(spawn_and_remove, 5000)
+
+        def due_spawn():
+            # Наступившее появление: извлечение из очереди, размещение и перепланирование
+            spawner.queue[:] = [(engine.time - 1.0, 0, SPAWN, "bomb")]
+            engine.events = []
+            engine.process_bonus_schedule(engine.time)
+            engine.remove_bonus(engine.events[0][1], "expire")
+
+        results[f"engine.process_bonus_schedule[fill={ratio}]"] = measure(due_spawn, 5000)
+
+
+def bench_collisions(results):
+    for count in BONUS_COUNTS:
+        engine = make_engine(80, 60, 3, unlimited_settings())
+        for _ in range(count):
+            engine.spawn_bonus("bomb")
+        engine.bonus_counts["food"] = 1
+        results[f"engine.handle_collisions[bonuses={count}]"] = measure(
+            lambda: engine.handle_collisions(engine.players), 20000)
+
+
+def bench_snakes(results):
+    # Змейки на своих полосах идут вправо по кругу и не сталкиваются
+    for count in SNAKE_COUNTS:
+        engine = GameEngine(80, 60, border_mode=False, seed=1, bonus_settings={}, snake_count=count)
+        engine.bonus_counts["food"] = 1
+        results[f"engine.step[snakes={count}]"] = measure(engine.step, 2000)
+
+
+def bench_bots(results):
+    # Поле расстояний чинится после каждого шага; для сравнения - полная заливка заново.
+    # С seed=1 партия восьми автопилотов на этих полях длится дольше замеров.
+    for cols, rows in FIELD_BOARDS:
+        engine = GameEngine(cols, rows, border_mode=False, seed=1, snake_count=8)
+        field = DistanceField(engine)
+        bots = [Autopilot(engine, number, field) for number in range(len(engine.players))]
+
+        def step():
+            for bot in bots:
+                if bot.player.alive:
+                    engine.change_direction(bot.choose(), bot.number)
+            engine.step()
+
+        results[f"autopilot.step[snakes=8,board={cols}x{rows}]"] = measure(step, 200)
+        results[f"pathfinding.rebuild[board={cols}x{rows}]"] = measure(field.rebuild, 5)
+
+        greedy = [GreedyBot(engine, number) for number in range(len(engine.players))]
+        results[f"greedy.choose[board={cols}x{rows}]"] = measure(greedy[0].choose, 2000)
+
+
+def bench_env(results):
+    # Время одного шага одного поля: у векторного окружения - шаг всех полей, делённый на их число
+    import numpy as np
+    from src.rl.env import SnakeEnv
+    from src.rl.vector_env import VecSnakeEnv
+
+    env = SnakeEnv()
+    env.reset(seed=1)
+    actions = iter(np.random.default_rng(1).integers(0, 4, 10 ** 6))
+
+    def step():
+        _, _, terminated, truncated, _ = env.step(next(actions))
+        if terminated or truncated:
+            env.reset()
+
+    results["env.step"] = measure(step, 2000)
+    for count in ENV_COUNTS:
+        vector = VecSnakeEnv(count)
+        vector.reset(seed=1)
+        batch = np.random.default_rng(1).integers(0, 4, (64, count))
+        rounds = iter(range(10 ** 9))
+        results[f"vector_env.step[envs={count}]"] = measure(
+            lambda: vector.step(batch[next(rounds) % len(batch)]), 100) / count
+
+
+def bench_render(results):
+    from src.game.game import Game
+    for width, height in RESOLUTIONS:
+        screen = pygame.display.set_mode((width, height))
+        for dirty in (False, True):
+            # Одинаковый seed - одинаковая партия при каждом запуске
+            random.seed(1)
+            game = Game(width, height, border_mode=False, dirty_rendering=dirty)
+            for _ in range(20):
+                game.update()
+            game.full_redraw = True
+            game.render(screen)
+
+            def frame():
+                game.update()
+                game.render(screen)
+
+            mode = "dirty" if dirty else "full"
+            results[f"game.render[{width}x{height},{mode}]"] = measure(frame, 50, repeat=3)
+
+    # Стоимость кадра на больших полях должна зависеть от окна, а не от поля
+    screen = pygame.display.set_mode((800, 600))
+    for cols, rows in BOARD_SIZES:
+        random.seed(1)
+        game = Game(800, 600, border_mode=False, dirty_rendering=False, board_size=(cols, rows))
+
+        def frame():
+            game.update()
+            game.render(screen)
+
+        results[f"game.render[board={cols}x{rows}]"] = measure(frame, 50, repeat=3)
+
+
+def bench_startup(results, runs=3):
+    best = float("inf")
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True,
+                                text=True, check=True, env=dict(HEADLESS_ENV, **os.environ)).stdout
+        best = min(best, float(output.strip().splitlines()[-1]))
+    results["startup.first_menu_frame"] = best
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)["metrics"]
+
+    regressions = []
+    for name, value in sorted(results.items()):
+        if name not in baseline:
+            continue
+        ratio = value / baseline[name] if baseline[name] else float("inf")
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{status:>10}  {name}: {baseline[name] * 1e6:.2f}us -> {value * 1e6:.2f}us ({ratio:.2f}x)")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the game's hot paths")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a metric counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--only", nargs="*",
+                        choices=["snake", "spawn", "collisions", "snakes", "bots", "env", "render", "startup"],
+                        help="run only these groups")
+    args = parser.parse_args()
+
+    for name, value in HEADLESS_ENV.items():
+        os.environ.setdefault(name, value)
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    groups = args.only or ["snake", "spawn", "collisions", "snakes", "bots", "env", "render", "startup"]
+
+    results = {}
+    if "snake" in groups:
+        bench_snake(results)
+    if "spawn" in groups:
+        bench_spawn(results)
+    if "collisions" in groups:
+        bench_collisions(results)
+    if "snakes" in groups:
+        bench_snakes(results)
+    if "bots" in groups:
+        bench_bots(results)
+    if "env" in groups:
+        bench_env(results)
+    if "render" in groups:
+        bench_render(results)
+    if "startup" in groups:
+        bench_startup(results)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({
+            "meta": {"python": platform.python_version(), "pygame": pygame.version.ver,
+                     "machine": platform.machine(), "timestamp": time.time()},
+            "metrics": results,
+        }, file, indent=4)
+    for name, value in results.items():
+        print(f"{name}: {value * 1e6:.2f}us")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
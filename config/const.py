@@ -7,8 +7,78 @@ GAME_TITLE = 'SNAKE 2025'
 # Numeric constants #
 #####################
 WINDOW_SIZE = (800, 600)
-CELL_SIZE = 25
+# Сколько клеток помещается в окне: размер клетки подбирается по размеру окна
+VIEW_CELLS = (32, 24)
+MIN_CELL_SIZE = 10
+# Сторона плитки фона в клетках
+BACKGROUND_TILE_CELLS = 4
 GAME_SPEED = 10
+# Размер поля в клетках (столбцы, строки); None - VIEW_CELLS.
+# Поле больше окна прокручивается камерой за головой змейки
+BOARD_SIZE = None
+# Сколько змеек может быть на одном поле (игроки и боты)
+MAX_SNAKES = 64
+# Цвета змеек соперников (первая змейка без окраски)
+SNAKE_COLORS = tuple(
+    (80 + (i * 97) % 176, 80 + (i * 57) % 176, 80 + (i * 151) % 176) for i in range(MAX_SNAKES - 1)
+)
+# Сколько свободных клеток автопилот ищет за выбранным ходом, чтобы не заехать в тупик
+AUTOPILOT_SPACE_CHECK = 64
+
+# Логика идёт с шагом 1 / скорость змейки, отрисовка - с частотой RENDER_FPS
+RENDER_FPS = 60
+# Сколько шагов логики можно догнать за один кадр, прежде чем пропустить отставание
+MAX_TICKS_PER_FRAME = 5
+# Плавное движение головы и хвоста между клетками (отключает частичную перерисовку)
+INTERPOLATE_MOTION = False
+
+# Фоновая запись: сколько разных файлов/записей может ждать сохранения
+WRITE_QUEUE_SIZE = 64
+# Вызывать fsync перед переименованием временного файла
+FSYNC_WRITES = True
+
+# Сколько последних кадров учитывать в процентилях профилировщика
+PROFILER_HISTORY = 300
+
+# Сколько отрендеренных строк текста держать в кэше
+TEXT_CACHE_SIZE = 512
+
+# Перерисовывать только изменившиеся клетки вместо всего окна
+DIRTY_RENDERING = True
+
+# Окружения для обучения агентов: размер поля по умолчанию и предел шагов партии
+ENV_BOARD_SIZE = (12, 12)
+ENV_MAX_STEPS = 2000
+
+# Турнир ботов: предел шагов партии, предел времени партии в секундах
+# и сколько партий отдаётся процессу за раз
+TOURNAMENT_MAX_TICKS = 20000
+TOURNAMENT_GAME_TIMEOUT = 60
+TOURNAMENT_CHUNK_SIZE = 8
+
+# Сервер комнат: адрес, число змеек в комнате (свободные места занимают боты),
+# пауза между раундами, предел неотправленных данных клиента и период вывода статистики
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+ROOM_SLOTS = 4
+ROUND_RESTART_DELAY = 3
+CLIENT_WRITE_LIMIT = 256 * 1024
+SERVER_STATS_INTERVAL = 5
+# На сколько шагов комната может отстать от расписания, прежде чем пропущенные шаги отбрасываются
+ROOM_MAX_CATCHUP_TICKS = 5
+
+##################
+# Bonus settings #
+##################
+BONUS_SETTINGS = {
+    "food": {"max_count": 10, "lifetime": 60, "spawn_interval": 5},
+    "poisoned_food": {"max_count": 5, "lifetime": 15, "spawn_interval": 10},
+    "bomb": {"max_count": 3, "lifetime": 30, "spawn_interval": 15},
+    "speedup": {"max_count": 3, "lifetime": 15, "spawn_interval": 20},
+    "clock": {"max_count": 1, "lifetime": 15, "spawn_interval": 25},
+    "double_points": {"max_count": 1, "lifetime": 60, "spawn_interval": 30},
+    "inverted_controls": {"max_count": 1, "lifetime": 15, "spawn_interval": 35},
+}
 
 ##################
 # Path to images #
@@ -50,5 +120,6 @@ SNAKE_IMAGES = {
 ###################
 SOUNDTRACK_PATH = "data/music/plenka everything that I can't forget.mp3"
 BEST_SCORES_FILE = "db/best_scores.csv"
+BEST_SCORES_DB = "db/best_scores.sqlite3"
 LOCALE_FILENAME = 'localization/locale.json'
 SETTINGS_FILENAME = 'db/settings.json'
@@ -0,0 +1,24 @@
+import json
+from config.const import LOCALE_FILENAME
+
+# Каталог локализации читается с диска один раз за процесс,
+# словари языков выдаются из кэша
+_catalog = None
+_languages = {}
+
+
+def load_catalog():
+    global _catalog
+    if _catalog is None:
+        with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
+            _catalog = json.load(file)
+    return _catalog
+
+
+def get_texts(language):
+    texts = _languages.get(language)
+    if texts is None:
+        catalog = load_catalog()
+        texts = catalog.get(language, catalog["en"])
+        _languages[language] = texts
+    return texts
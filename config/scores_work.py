@@ -1,31 +1,104 @@
 import csv
 import os
-from config.const import BEST_SCORES_FILE
+import sqlite3
+import threading
+from config.const import BEST_SCORES_FILE, BEST_SCORES_DB, FSYNC_WRITES
+from config import storage_work
 
+# Таблица рекордов в SQLite: имя - первичный ключ, по очкам есть индекс,
+# поэтому обновление рекорда и выборка топа не читают всю таблицу
+_connection = None
+_lock = threading.RLock()
+# Очки, ещё не записанные фоновым потоком. Свой замок: основной поток не должен
+# ждать, пока поток записи держит _lock на время транзакции с fsync
+_pending_lock = threading.Lock()
+_pending_scores = {}
 
-def load_best_scores():
-    if not os.path.exists(BEST_SCORES_FILE):
-        return {}
 
-    best_scores = {}
-    with open(BEST_SCORES_FILE, "r", encoding="utf-8") as file:
+def get_connection():
+    global _connection
+    if _connection is None:
+        is_new = not os.path.exists(BEST_SCORES_DB)
+        _connection = sqlite3.connect(BEST_SCORES_DB, check_same_thread=False)
+        _connection.execute(f"PRAGMA synchronous = {'FULL' if FSYNC_WRITES else 'OFF'}")
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS best_scores (name TEXT PRIMARY KEY, score INTEGER NOT NULL)")
+        _connection.execute(
+            "CREATE INDEX IF NOT EXISTS best_scores_score ON best_scores (score DESC)")
+        _connection.commit()
+        if is_new:
+            import_csv(BEST_SCORES_FILE)
+    return _connection
+
+
+def import_csv(path):
+    # Перенос рекордов из старого формата "имя;очки"
+    if not os.path.exists(path):
+        return 0
+
+    rows = []
+    with open(path, "r", encoding="utf-8") as file:
         reader = csv.reader(file, delimiter=";")
         for row in reader:
             if len(row) == 2:
                 name, score = row
-                best_scores[name] = int(score)
-    return best_scores
+                rows.append((name, int(score)))
+    save_best_scores(dict(rows))
+    return len(rows)
+
+
+def load_best_scores():
+    with _lock:
+        rows = get_connection().execute("SELECT name, score FROM best_scores").fetchall()
+    return {name: score for name, score in rows}
 
 
 def save_best_scores(best_scores):
-    with open(BEST_SCORES_FILE, "w", encoding="utf-8", newline="") as file:
-        writer = csv.writer(file, delimiter=";")
-        for name, score in best_scores.items():
-            writer.writerow([name, score])
+    with _lock:
+        connection = get_connection()
+        with connection:
+            connection.executemany(
+                "INSERT INTO best_scores (name, score) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET score = excluded.score "
+                "WHERE excluded.score > best_scores.score",
+                list(best_scores.items()))
 
 
 def update_best_score(username, score):
-    best_scores = load_best_scores()
-    if username not in best_scores or score > best_scores[username]:
-        best_scores[username] = score
-        save_best_scores(best_scores)
+    save_best_scores({username: score})
+
+
+def update_best_score_async(username, score):
+    # Несколько результатов одного игрока до записи схлопываются в лучший
+    with _pending_lock:
+        _pending_scores[username] = max(score, _pending_scores.get(username, score))
+    storage_work.submit(("best_score", username), lambda: _write_pending_score(username))
+
+
+def _write_pending_score(username):
+    # Результат остаётся среди ожидающих до конца записи, чтобы топ не терял его между ними
+    with _pending_lock:
+        score = _pending_scores.get(username)
+    if score is None:
+        return
+    update_best_score(username, score)
+    with _pending_lock:
+        if _pending_scores.get(username) == score:
+            del _pending_scores[username]
+
+
+def top_scores(limit):
+    # Ещё не записанные результаты подмешиваются к таблице, иначе свежий рекорд
+    # не попадёт в топ, пока поток записи не дойдёт до него
+    with _pending_lock:
+        pending = dict(_pending_scores)
+    with _lock:
+        rows = get_connection().execute(
+            "SELECT name, score FROM best_scores ORDER BY score DESC LIMIT ?", (limit,)).fetchall()
+    if not pending:
+        return rows
+    scores = dict(rows)
+    for name, score in pending.items():
+        if score > scores.get(name, score - 1):
+            scores[name] = score
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
@@ -0,0 +1,94 @@
+import atexit
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from config.const import WRITE_QUEUE_SIZE, FSYNC_WRITES
+
+
+def write_atomic(path, text, fsync=FSYNC_WRITES):
+    # Запись во временный файл рядом и переименование поверх старого
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# Фоновая запись на диск. Задачи с одинаковым ключом схлопываются:
+# выполняется только последняя поставленная. Очередь ограничена
+# WRITE_QUEUE_SIZE разными ключами.
+class BackgroundWriter:
+    def __init__(self, max_pending=WRITE_QUEUE_SIZE):
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.busy = False
+        self.stopping = False
+
+    def submit(self, key, task):
+        with self.condition:
+            while key not in self.pending and len(self.pending) >= self.max_pending:
+                self.condition.wait()
+            self.pending[key] = task
+            if self.thread is None:
+                self.stopping = False
+                self.thread = threading.Thread(target=self.run, name="background-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                key, task = self.pending.popitem(last=False)
+                self.busy = True
+                self.condition.notify_all()
+
+            try:
+                task()
+            except Exception as e:
+                print(f"Error while saving {key}: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            while self.pending or self.busy:
+                self.condition.wait()
+
+    def shutdown(self):
+        with self.condition:
+            thread = self.thread
+            self.stopping = True
+            self.thread = None
+            self.condition.notify_all()
+        if thread is not None:
+            thread.join()
+
+
+writer = BackgroundWriter()
+# При выходе через sys.exit (в т.ч. по pygame.QUIT) всё несохранённое дописывается
+atexit.register(writer.shutdown)
+
+
+def submit(key, task):
+    writer.submit(key, task)
+
+
+def flush():
+    writer.flush()
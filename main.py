@@ -1,10 +1,21 @@
+import time
+
+# Отсчёт --startup-profile идёт с первой строки, до импорта pygame
+STARTUP_START = time.perf_counter()
+
+import argparse
+import os
 import pygame
 import sys
 import json
-from src.game.game import Game
+from functools import partial
 from src.ui.main_menu import MainMenu
-from config.const import GAME_TITLE, SETTINGS_FILENAME, SOUNDTRACK_PATH
-from src.ui.settings_menu import SettingsMenu
+from config.const import GAME_TITLE, SETTINGS_FILENAME, SOUNDTRACK_PATH, BOARD_SIZE, WINDOW_SIZE, MAX_SNAKES, VIEW_CELLS
+from src.engine.cli import board_size, check_board
+from src.game import assets, sound
+from src.game.profiler import StartupProfiler
+from src.game.window import create_window, window_resized
+from config import storage_work
 
 
 def load_settings():
@@ -16,12 +27,61 @@ def load_settings():
         return {"language": "en", "border_mode": True, "sound_enabled": True}
 
 
+def record_path(path, game_number):
+    # Первая партия пишется в указанный файл, следующие - рядом с номером
+    if path is None or game_number == 1:
+        return path
+    base, extension = os.path.splitext(path)
+    return f"{base}-{game_number}{extension}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument("--record", metavar="FILE",
+                        help="record each game to a replay file; later games of the session get -2, -3, ... suffixes")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded game")
+    parser.add_argument("--headless", action="store_true", help="play back the replay without a window")
+    parser.add_argument("--board", metavar="COLSxROWS", type=board_size, default=BOARD_SIZE,
+                        help="board size in cells, e.g. 500x500 (default: one window of cells)")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="local players: arrows for the first, WASD for the second")
+    parser.add_argument("--bots", type=int, default=0, help="number of bot snakes")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="demo mode: the first snake is driven by the autopilot, scores are not saved")
+    parser.add_argument("--fullscreen", action="store_true", help="start in fullscreen (toggle with F11)")
+    parser.add_argument("--profile", action="store_true", help="show the frame profiler overlay (toggle with F3)")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="save per-frame timings of each game as Chrome trace JSON (or CSV for *.csv)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print how long each startup stage took until the first menu frame")
+    args = parser.parse_args()
+    if args.bots < 0 or args.players + args.bots > MAX_SNAKES:
+        parser.error(f"players and bots together must be at most {MAX_SNAKES}")
+    check_board(parser, args.board if args.board is not None else VIEW_CELLS, args.players + args.bots)
+    return args
+
+
 def main():
-    pygame.init()
-    pygame.mixer.init()
-    width, height = 800, 600
-    screen = pygame.display.set_mode((width, height))
+    args = parse_args()
+    profiler = StartupProfiler(STARTUP_START) if args.startup_profile else None
+    if profiler is not None:
+        profiler.mark("imports")
+    replay = None
+    if args.replay:
+        from src.engine.replay import Replay, replay_headless
+        if args.headless:
+            replay_headless(args.replay)
+            return
+        replay = Replay.load(args.replay)
+
+    # Только нужные подсистемы: звук поднимается в фоне вместе с музыкой
+    pygame.display.init()
+    pygame.font.init()
+    screen = create_window(WINDOW_SIZE, args.fullscreen)
+    width, height = screen.get_size()
     pygame.display.set_caption(GAME_TITLE)
+    if profiler is not None:
+        profiler.mark("window")
 
     settings = load_settings()
     language = settings.get("language", "en")
@@ -29,11 +89,17 @@ def main():
     sound_enabled = settings.get("sound_enabled", True)
     username = settings.get("username", "Player")
 
-    pygame.mixer.music.load(SOUNDTRACK_PATH)
-    pygame.mixer.music.play(-1)
-    if not sound_enabled:
-        pygame.mixer.music.pause()
-
+    on_soundtrack = on_sprites = None
+    if profiler is not None:
+        on_soundtrack = partial(profiler.mark, "soundtrack")
+        on_sprites = partial(profiler.mark, "sprite prefetch")
+    sound.start_soundtrack(SOUNDTRACK_PATH, sound_enabled, on_soundtrack)
+    assets.prefetch(on_sprites)
+    if profiler is not None:
+        profiler.mark("settings")
+
+    first_frame = True
+    games_played = 0
     while True:
         main_menu = MainMenu(
             width, height, language=language, border_mode=border_mode)
@@ -42,19 +108,39 @@ def main():
         while running:
             events = pygame.event.get()
             for event in events:
-                if event.type == pygame.QUIT:
+                size = window_resized(event)
+                if size is not None:
+                    width, height = size
+                    main_menu.resize(width, height)
+                elif event.type == pygame.QUIT:
+                    storage_work.flush()
                     pygame.quit()
                     sys.exit()
 
             main_menu.handle_events(events)
             main_menu.render(screen)
             pygame.display.flip()
+            if first_frame:
+                first_frame = False
+                if profiler is not None:
+                    profiler.mark("first menu frame")
+                    profiler.report()
 
             if hasattr(main_menu, "start_game_flag") and main_menu.start_game_flag:
+                # Окно могло измениться и в окнах справки или рейтинга
+                width, height = screen.get_size()
+                from src.game.game import Game
+                games_played += 1
                 game = Game(width, height, language=language,
-                            border_mode=border_mode)
+                            border_mode=border_mode, record_path=record_path(args.record, games_played),
+                            replay=replay,
+                            show_profiler=args.profile, profile_trace=args.profile_trace,
+                            board_size=args.board, players=args.players, bots=args.bots,
+                            autopilot=args.autopilot)
                 game.snake.username = username
                 result = game.run(screen)
+                width, height = screen.get_size()
+                main_menu.resize(width, height)
 
                 if result == "restart":
                     continue
@@ -62,6 +148,8 @@ def main():
                     break
 
             if hasattr(main_menu, "open_settings_flag") and main_menu.open_settings_flag:
+                width, height = screen.get_size()
+                from src.ui.settings_menu import SettingsMenu
                 settings_menu = SettingsMenu(
                     width, height, language=language, sound_enabled=sound_enabled, border_mode=border_mode)
                 settings_menu_running = True
@@ -69,7 +157,12 @@ def main():
                 while settings_menu_running:
                     settings_events = pygame.event.get()
                     for event in settings_events:
-                        if event.type == pygame.QUIT:
+                        size = window_resized(event)
+                        if size is not None:
+                            width, height = size
+                            settings_menu.resize(width, height)
+                        elif event.type == pygame.QUIT:
+                            storage_work.flush()
                             pygame.quit()
                             sys.exit()
 
@@ -0,0 +1,146 @@
+import random
+from config.const import AUTOPILOT_SPACE_CHECK
+from src.engine.snake_model import OPPOSITE_DIRECTIONS
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+# Бонусы, в которые бот не заходит
+DANGEROUS_BONUSES = ("bomb", "poisoned_food")
+
+
+class Bot:
+    def __init__(self, engine, number):
+        self.engine = engine
+        self.number = number
+
+    @property
+    def player(self):
+        return self.engine.players[self.number]
+
+    def is_safe(self, index):
+        if index is None or self.engine.grid.occupancy[index]:
+            return False
+        bonus = self.engine.grid.bonus_at.get(index)
+        return bonus is None or bonus.kind not in DANGEROUS_BONUSES
+
+    def command(self, direction):
+        # Инвертированное управление развернёт команду, поэтому отдаётся противоположная
+        if self.player.snake.inverted_controls:
+            return OPPOSITE_DIRECTIONS[direction]
+        return direction
+
+
+# Жадный бот: идёт к ближайшей еде, выбирая только безопасные клетки рядом с головой.
+# Решение стоит O(бонусов), поэтому десятки ботов не замедляют шаг.
+class GreedyBot(Bot):
+    def distance(self, a, b):
+        engine = self.engine
+        (ax, ay), (bx, by) = engine.grid.cell(a), engine.grid.cell(b)
+        dx, dy = abs(ax - bx), abs(ay - by)
+        if not engine.border_mode:
+            dx = min(dx, engine.cols - dx)
+            dy = min(dy, engine.rows - dy)
+        return dx + dy
+
+    def nearest_food(self, head):
+        best = None
+        best_distance = None
+        for index, bonus in self.engine.bonuses.items():
+            if bonus.kind == "food":
+                distance = self.distance(head, index)
+                if best is None or distance < best_distance:
+                    best, best_distance = index, distance
+        return best
+
+    def choose(self):
+        engine = self.engine
+        snake = self.player.snake
+        head = snake.head_index
+        target = self.nearest_food(head)
+
+        best = None
+        best_key = None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE_DIRECTIONS[snake.direction]:
+                continue
+            index = engine.grid.offset(head, direction, 1, engine.border_mode)
+            key = (not self.is_safe(index),
+                   self.distance(index, target) if index is not None and target is not None else 0,
+                   direction != snake.direction)
+            if best_key is None or key < best_key:
+                best, best_key = direction, key
+        return self.command(best)
+
+
+# Случайный бот: любое направление, кроме разворота
+class RandomBot(Bot):
+    def __init__(self, engine, number, seed=None):
+        super().__init__(engine, number)
+        self.rng = random.Random(seed)
+
+    def choose(self):
+        direction = self.player.snake.direction
+        return self.command(self.rng.choice([d for d in DIRECTIONS if d != OPPOSITE_DIRECTIONS[direction]]))
+
+
+# Скриптовый бот: едет прямо и сворачивает, только когда впереди опасно,
+# по очереди направо и налево, чтобы не крутиться на месте
+class ScriptedBot(Bot):
+    TURNS = {"UP": ("RIGHT", "LEFT"), "DOWN": ("LEFT", "RIGHT"),
+             "LEFT": ("UP", "DOWN"), "RIGHT": ("DOWN", "UP")}
+
+    def __init__(self, engine, number):
+        super().__init__(engine, number)
+        self.turns = 0
+
+    def choose(self):
+        engine = self.engine
+        snake = self.player.snake
+        head = snake.head_index
+        direction = snake.direction
+        if self.is_safe(engine.grid.offset(head, direction, 1, engine.border_mode)):
+            return self.command(direction)
+        turns = self.TURNS[direction]
+        if self.turns % 2:
+            turns = turns[::-1]
+        self.turns += 1
+        for turn in turns:
+            if self.is_safe(engine.grid.offset(head, turn, 1, engine.border_mode)):
+                return self.command(turn)
+        return self.command(direction)
+
+
+# Автопилот: идёт по полю расстояний в обход тел, бомб и яда, а перед ходом проверяет,
+# что за ним хватит места. Одно поле DistanceField делят все автопилоты движка.
+class Autopilot(Bot):
+    def __init__(self, engine, number, field):
+        super().__init__(engine, number)
+        self.field = field
+
+    def choose(self):
+        field = self.field
+        field.sync()
+        snake = self.player.snake
+        head = snake.head_index
+
+        moves = []
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE_DIRECTIONS[snake.direction]:
+                continue
+            index = field.directions[direction][head]
+            if index >= 0 and not field.blocked[index]:
+                moves.append((field.dist[index], direction != snake.direction, direction, index))
+        if not moves:
+            return self.command(snake.direction)
+        moves.sort()
+
+        # Ближайший к еде ход, за которым есть место для всей змейки; иначе самый просторный
+        need = min(len(snake), AUTOPILOT_SPACE_CHECK)
+        roomiest = None
+        roomiest_space = -1
+        for _, _, direction, index in moves:
+            space = field.free_space(index, AUTOPILOT_SPACE_CHECK)
+            if space >= need:
+                return self.command(direction)
+            if space > roomiest_space:
+                roomiest, roomiest_space = direction, space
+        return self.command(roomiest)
@@ -0,0 +1,22 @@
+import argparse
+from src.engine.snake_model import start_bodies
+
+
+# Общие для main.py, сервера и турнира разборщики аргументов командной строки
+def board_size(value):
+    try:
+        cols, rows = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, got {value!r}")
+    if cols < 3 or rows < 1:
+        raise argparse.ArgumentTypeError(f"board {value} is too small")
+    return cols, rows
+
+
+def check_board(parser, board, snakes):
+    # Стартовые змейки должны поместиться на поле, иначе движок не создастся
+    cols, rows = board
+    try:
+        start_bodies(cols, rows, snakes)
+    except ValueError:
+        parser.error(f"board {cols}x{rows} is too small for {snakes} snakes")
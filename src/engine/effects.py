@@ -0,0 +1,75 @@
+import heapq
+from enum import Enum
+
+
+# Значение эффекта - ключ подписи в locale.json ("effects")
+class Effect(Enum):
+    SPEED_BOOST = "speed_boost"
+    SLOW_DOWN = "slow_down"
+    DOUBLE_POINTS = "double_points"
+    INVERTED_CONTROLS = "inverted_controls"
+
+
+EFFECT_DURATIONS = {
+    Effect.SPEED_BOOST: 15,
+    Effect.SLOW_DOWN: 15,
+    Effect.DOUBLE_POINTS: 60,
+    Effect.INVERTED_CONTROLS: 15,
+}
+
+# Правила наложения: повторный эффект того же типа не складывается, а
+# продлевается на полную длительность; эффекты из CANCELS снимают друг друга.
+CANCELS = {
+    Effect.SPEED_BOOST: (Effect.SLOW_DOWN,),
+    Effect.SLOW_DOWN: (Effect.SPEED_BOOST,),
+}
+
+
+# Планировщик эффектов на мин-куче сроков окончания. Устаревшие записи кучи
+# (после продления или отмены) пропускаются при извлечении, поэтому
+# каждое окончание срабатывает ровно один раз, а шаг стоит O(истёкших эффектов).
+class EffectScheduler:
+    def __init__(self):
+        self.expiries = {}
+        self.heap = []
+        self.counter = 0
+
+    def __contains__(self, effect):
+        return effect in self.expiries
+
+    def __len__(self):
+        return len(self.expiries)
+
+    def __iter__(self):
+        # Активные эффекты в порядке включения: (effect, expiry)
+        return iter(self.expiries.items())
+
+    def activate(self, effect, now):
+        cancelled = [other for other in CANCELS.get(effect, ()) if other in self.expiries]
+        for other in cancelled:
+            del self.expiries[other]
+
+        # Продлённый эффект переезжает в конец списка, как новый
+        self.expiries.pop(effect, None)
+        expiry = now + EFFECT_DURATIONS[effect]
+        self.expiries[effect] = expiry
+        self.counter += 1
+        heapq.heappush(self.heap, (expiry, self.counter, effect))
+        return cancelled
+
+    def cancel(self, effect):
+        return self.expiries.pop(effect, None) is not None
+
+    def expire(self, now):
+        expired = []
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            expiry, _, effect = heapq.heappop(heap)
+            if self.expiries.get(effect) == expiry:
+                del self.expiries[effect]
+                expired.append(effect)
+        return expired
+
+    def clear(self):
+        self.expiries.clear()
+        self.heap.clear()
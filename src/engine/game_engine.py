@@ -0,0 +1,309 @@
+import random
+from config.const import GAME_SPEED, BONUS_SETTINGS, MAX_SNAKES
+from src.engine.effects import Effect, EffectScheduler
+from src.engine.grid import Grid
+from src.engine.snake_model import SnakeModel, start_bodies
+from src.engine.spawner import SpawnScheduler, SPAWN
+
+BONUS_KINDS = ("food", "poisoned_food", "bomb", "speedup",
+               "clock", "double_points", "inverted_controls")
+
+
+class Bonus:
+    __slots__ = ("kind", "index", "cell", "spawn_time", "lifetime")
+
+    def __init__(self, kind, index, cell, spawn_time, lifetime):
+        self.kind = kind
+        self.index = index
+        self.cell = cell
+        self.spawn_time = spawn_time
+        self.lifetime = lifetime
+
+
+# Состояние одной змейки: очки, скорость и эффекты у каждой свои.
+# next_move - время следующего хода змейки в симулированных секундах.
+class PlayerState:
+    def __init__(self, number, snake):
+        self.number = number
+        self.snake = snake
+        self.score = 0
+        self.score_multiplier = 1
+        self.game_speed = GAME_SPEED
+        self.effects = EffectScheduler()
+        self.alive = True
+        self.death_cause = None
+        self.next_move = 1 / GAME_SPEED
+
+
+# Чистая логика игры: поле, змейки, бонусы, эффекты и очки.
+# Время симулируется: шаг переносит время к ближайшему ходу какой-либо змейки,
+# каждая змейка ходит раз в 1 / её скорость секунд. Все змейки делят одно поле,
+# поэтому проверка столкновений стоит O(змеек) за шаг.
+# Игрок 0 - основной: score, effects и прочие свойства движка относятся к нему.
+class GameEngine:
+    def __init__(self, cols, rows, border_mode=True, seed=None, bonus_settings=None, snake_count=1,
+                 body=None, direction="RIGHT"):
+        if not 1 <= snake_count <= MAX_SNAKES:
+            raise ValueError(f"Число змеек должно быть от 1 до {MAX_SNAKES}")
+        if body is not None and snake_count != 1:
+            raise ValueError("Начальное тело задаётся только для одиночной игры")
+        self.cols = cols
+        self.rows = rows
+        self.border_mode = border_mode
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = None
+        self.profiler = None
+        self.grid = Grid(cols, rows)
+        if snake_count == 1:
+            snakes = [SnakeModel(self.grid, body, direction)]
+        else:
+            snakes = [SnakeModel(self.grid, body) for body in start_bodies(cols, rows, snake_count)]
+        self.players = [PlayerState(i, snake) for i, snake in enumerate(snakes)]
+        # Одиночная игра идёт до смерти змейки, общая - пока живы хотя бы двое
+        self.min_alive = min(snake_count, 2)
+        self.alive_count = snake_count
+        self.bonus_settings = bonus_settings if bonus_settings is not None else BONUS_SETTINGS
+        self.spawner = SpawnScheduler(self.bonus_settings)
+        self.bonuses = {}
+        self.bonus_counts = dict.fromkeys(BONUS_KINDS, 0)
+        self.bonus_handlers = {
+            "food": self.eat_food,
+            "poisoned_food": self.eat_poisoned_food,
+            "bomb": self.eat_bomb,
+            "speedup": self.eat_speedup,
+            "clock": self.eat_clock,
+            "double_points": self.eat_double_points,
+            "inverted_controls": self.eat_inverted_controls,
+        }
+        self.effect_end_handlers = {
+            Effect.SPEED_BOOST: self.reset_speed,
+            Effect.SLOW_DOWN: self.reset_speed,
+            Effect.DOUBLE_POINTS: self.reset_score_multiplier,
+            Effect.INVERTED_CONTROLS: self.reset_controls,
+        }
+        self.time = 0.0
+        self.ticks = 0
+        self.running = True
+        self.death_cause = None
+        self.events = []
+
+    @property
+    def snake(self):
+        return self.players[0].snake
+
+    @property
+    def score(self):
+        return self.players[0].score
+
+    @property
+    def score_multiplier(self):
+        return self.players[0].score_multiplier
+
+    @property
+    def game_speed(self):
+        return self.players[0].game_speed
+
+    @property
+    def effects(self):
+        return self.players[0].effects
+
+    @property
+    def tick_interval(self):
+        return self.next_move_time() - self.time
+
+    def next_move_time(self):
+        # Ближайший ход среди живых змеек
+        moves = [player.next_move for player in self.players if player.alive]
+        return min(moves) if moves else self.time + 1 / self.game_speed
+
+    def change_direction(self, direction, number=0):
+        self.players[number].snake.change_direction(direction)
+
+    def step(self, action=None):
+        self.events = []
+        if not self.running:
+            return False
+
+        if action is not None:
+            self.change_direction(action)
+        if self.recorder is not None:
+            self.recorder.record(self.snake.next_direction)
+
+        self.time = self.next_move_time()
+        self.ticks += 1
+        movers = [player for player in self.players if player.alive and player.next_move <= self.time]
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark()
+
+        self.move_snakes(movers)
+        if profiler is not None:
+            profiler.lap("move")
+        if not self.running:
+            return False
+
+        self.process_bonus_schedule(self.time)
+        self.handle_collisions(movers)
+        if profiler is not None:
+            profiler.lap("collisions")
+        self.update_active_effects(self.time)
+        if profiler is not None:
+            profiler.lap("effects")
+
+        for player in movers:
+            player.next_move = self.time + 1 / player.game_speed
+        return self.running
+
+    def move_snakes(self, movers):
+        # Все змейки ходят одновременно: сначала освобождаются хвосты, потом занимаются головы
+        heads = []
+        for player in movers:
+            new_head = player.snake.next_head(self.border_mode)
+            if new_head is None:
+                self.kill(player, "wall")
+            else:
+                heads.append((player, new_head))
+        for player, _ in heads:
+            player.snake.drop_tail()
+        for player, new_head in heads:
+            player.snake.push_head(new_head)
+
+    def kill(self, player, cause):
+        if not player.alive:
+            return
+        player.alive = False
+        player.death_cause = cause
+        player.snake.leave_grid()
+        self.alive_count -= 1
+        self.events.append(("death", player))
+        if self.alive_count < self.min_alive:
+            self.end_game(self.players[0].death_cause or "last_snake")
+
+    def end_game(self, cause):
+        if self.running:
+            self.running = False
+            self.death_cause = cause
+
+    def spawn_bonus(self, kind):
+        settings = self.bonus_settings.get(kind)
+        if settings is None or self.bonus_counts[kind] >= settings["max_count"]:
+            return None
+
+        exclude = ()
+        if kind == "bomb":
+            exclude = [index for player in self.players if player.alive
+                       for index in self.cells_ahead(player.snake, 5)]
+        index = self.grid.random_free_cell(self.rng, exclude)
+        if index is None:
+            return None
+
+        bonus = Bonus(kind, index, self.grid.cell(index), self.time, settings["lifetime"])
+        self.bonuses[index] = bonus
+        self.bonus_counts[kind] += 1
+        self.grid.place_bonus(index, bonus)
+        self.spawner.schedule_expiry(bonus)
+        self.events.append(("spawn", bonus))
+        return bonus
+
+    def cells_ahead(self, snake, distance):
+        cells = []
+        for i in range(1, distance + 1):
+            index = self.grid.offset(snake.head_index, snake.direction, i, self.border_mode)
+            if index is not None:
+                cells.append(index)
+        return cells
+
+    def process_bonus_schedule(self, current_time):
+        profiler = self.profiler
+        for action, payload in self.spawner.pop_due(current_time):
+            if action == SPAWN:
+                self.spawn_bonus(payload)
+            elif self.bonuses.get(payload.index) is payload:
+                # Съеденные раньше срока бонусы в очереди просто пропускаются
+                self.remove_bonus(payload, "expire")
+            if profiler is not None:
+                profiler.lap("spawn" if action == SPAWN else "expiry")
+
+    def remove_bonus(self, bonus, reason):
+        del self.bonuses[bonus.index]
+        self.bonus_counts[bonus.kind] -= 1
+        self.grid.remove_bonus(bonus.index)
+        self.events.append((reason, bonus))
+
+    def handle_collisions(self, movers):
+        # Голова в клетке, где есть кто-то ещё (своё или чужое тело, другая голова), - смерть.
+        # Сначала определяются все погибшие, поэтому при встрече голова к голове гибнут обе
+        # змейки, а бонус в спорной клетке никому не достаётся.
+        occupancy = self.grid.occupancy
+        crashed = [player for player in movers
+                   if player.alive and occupancy[player.snake.head_index] > 1]
+        for player in crashed:
+            self.kill(player, "self" if player.snake.bites_itself() else "snake")
+
+        bonus_at = self.grid.bonus_at
+        for player in movers:
+            if not player.alive:
+                continue
+            bonus = bonus_at.get(player.snake.head_index)
+            if bonus is not None:
+                self.remove_bonus(bonus, "eat")
+                self.bonus_handlers[bonus.kind](player)
+
+        if self.bonus_counts["food"] == 0:
+            self.spawn_bonus("food")
+
+    def eat_food(self, player):
+        player.snake.grow()
+        player.score += 10 * player.score_multiplier
+
+    def eat_poisoned_food(self, player):
+        if len(player.snake) > 1:
+            player.snake.shrink()
+        else:
+            self.kill(player, "poison")
+        if player.score < 8:
+            player.score = 0
+            self.kill(player, "poison")
+        else:
+            player.score -= 8
+
+    def eat_bomb(self, player):
+        self.kill(player, "bomb")
+
+    def eat_speedup(self, player):
+        player.effects.activate(Effect.SPEED_BOOST, self.time)
+        player.game_speed = GAME_SPEED * 2
+        player.score += 3 * player.score_multiplier
+
+    def eat_clock(self, player):
+        player.effects.activate(Effect.SLOW_DOWN, self.time)
+        player.game_speed = GAME_SPEED // 1.5
+        player.score += 3 * player.score_multiplier
+
+    def eat_double_points(self, player):
+        player.effects.activate(Effect.DOUBLE_POINTS, self.time)
+        player.score_multiplier = 2
+        player.score += 5 * player.score_multiplier
+
+    def eat_inverted_controls(self, player):
+        player.effects.activate(Effect.INVERTED_CONTROLS, self.time)
+        player.snake.inverted_controls = True
+        player.score += 9 * player.score_multiplier
+
+    def update_active_effects(self, current_time):
+        for player in self.players:
+            if player.alive:
+                for effect in player.effects.expire(current_time):
+                    self.effect_end_handlers[effect](player)
+
+    def reset_speed(self, player):
+        player.game_speed = GAME_SPEED
+
+    def reset_score_multiplier(self, player):
+        player.score_multiplier = 1
+
+    def reset_controls(self, player):
+        player.snake.inverted_controls = False
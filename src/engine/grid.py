@@ -0,0 +1,116 @@
+from array import array
+
+DIRECTION_OFFSETS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+
+
+# Поле в виде плоского массива клеток: index = row * cols + col.
+# occupancy хранит число сегментов змейки в каждой клетке
+# (после роста хвост временно занимает клетку дважды), bonus_at - словарь клетка -> бонус
+# (бонусов мало, поэтому на больших полях он почти ничего не занимает).
+# free_cells - массив свободных клеток с удалением через swap-remove,
+# free_positions - позиция клетки в free_cells или -1.
+class Grid:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.occupancy = array("H", bytes(2 * self.size))
+        self.bonus_at = {}
+        self.free_cells = array("i", range(self.size))
+        # Вначале все клетки свободны и стоят на своих местах: копия массива быстрее второго range
+        self.free_positions = array("i", self.free_cells)
+
+        # Разница индексов соседних клеток -> направление, включая переход через край
+        self.neighbour_directions = {}
+        for delta, direction in ((-(self.size - cols), "DOWN"), (self.size - cols, "UP"),
+                                 (-(cols - 1), "RIGHT"), (cols - 1, "LEFT"),
+                                 (cols, "DOWN"), (-cols, "UP"), (1, "RIGHT"), (-1, "LEFT")):
+            if delta:
+                self.neighbour_directions[delta] = direction
+
+    def index(self, cell):
+        return cell[1] * self.cols + cell[0]
+
+    def cell(self, index):
+        row, col = divmod(index, self.cols)
+        return col, row
+
+    def offset(self, index, direction, distance, border_mode):
+        dx, dy = DIRECTION_OFFSETS[direction]
+        row, col = divmod(index, self.cols)
+        col += dx * distance
+        row += dy * distance
+
+        if border_mode:
+            if col < 0 or col >= self.cols or row < 0 or row >= self.rows:
+                return None
+        else:
+            col %= self.cols
+            row %= self.rows
+        return row * self.cols + col
+
+    def direction_between(self, index, neighbour):
+        # Направление от клетки index к соседней клетке neighbour (None для той же клетки)
+        return self.neighbour_directions.get(neighbour - index)
+
+    def occupy(self, index):
+        if self.occupancy[index] == 0 and index not in self.bonus_at:
+            self.take_free_cell(index)
+        self.occupancy[index] += 1
+
+    def release(self, index):
+        self.occupancy[index] -= 1
+        if self.occupancy[index] == 0 and index not in self.bonus_at:
+            self.add_free_cell(index)
+
+    def is_occupied(self, index):
+        return self.occupancy[index] > 0
+
+    def place_bonus(self, index, bonus):
+        if self.occupancy[index] == 0 and index not in self.bonus_at:
+            self.take_free_cell(index)
+        self.bonus_at[index] = bonus
+
+    def remove_bonus(self, index):
+        del self.bonus_at[index]
+        if self.occupancy[index] == 0:
+            self.add_free_cell(index)
+
+    def is_free(self, index):
+        return self.free_positions[index] >= 0
+
+    def take_free_cell(self, index):
+        position = self.free_positions[index]
+        if position < 0:
+            return
+        last = self.free_cells.pop()
+        if last != index:
+            self.free_cells[position] = last
+            self.free_positions[last] = position
+        self.free_positions[index] = -1
+
+    def add_free_cell(self, index):
+        if self.free_positions[index] >= 0:
+            return
+        self.free_positions[index] = len(self.free_cells)
+        self.free_cells.append(index)
+
+    def random_free_cell(self, rng, exclude=()):
+        # Исключённые клетки временно убираются из free_cells,
+        # поэтому выбор удаётся всегда, если подходящая клетка есть
+        excluded = [index for index in exclude if self.is_free(index)]
+        for index in excluded:
+            self.take_free_cell(index)
+
+        index = None
+        if self.free_cells:
+            index = self.free_cells[rng.randrange(len(self.free_cells))]
+
+        for excluded_index in excluded:
+            self.add_free_cell(excluded_index)
+        return index
@@ -0,0 +1,223 @@
+from array import array
+from collections import deque
+
+INF = 2 ** 30
+# Бонусы, через которые путь не прокладывается
+OBSTACLE_BONUSES = ("bomb", "poisoned_food")
+TARGET_BONUSES = ("food",)
+
+
+def waves(starts, queue):
+    # Рёбра единичные, поэтому вместо кучи хватает отсортированных стартов, слитых
+    # с очередью волны: обе идут по неубыванию расстояния
+    starts.sort()
+    position = 0
+    while position < len(starts) or queue:
+        if queue and (position == len(starts) or queue[0][0] <= starts[position][0]):
+            yield queue.popleft()
+        else:
+            yield starts[position]
+            position += 1
+
+
+# Поле расстояний до ближайшей еды для всех змеек движка сразу.
+# Между шагами меняются лишь несколько клеток (новые головы, освобождённые хвосты,
+# бонусы, погибшие змейки), поэтому поле не заливается заново, а чинится:
+# сначала сбрасываются клетки, чьё расстояние могло вырасти (по возрастанию старого
+# расстояния, чтобы проверка опоры у соседа была окончательной), затем сброшенные
+# и освободившиеся клетки пересчитываются от соседей волной поиска в ширину.
+class DistanceField:
+    def __init__(self, engine):
+        self.engine = engine
+        grid = engine.grid
+        cols, rows, size = grid.cols, grid.rows, grid.size
+        wrap = not engine.border_mode
+
+        # Соседи клетки: индекс или -1 за краем поля
+        self.up = array("i", range(-cols, size - cols))
+        self.down = array("i", range(cols, size + cols))
+        self.left = array("i", range(-1, size - 1))
+        self.right = array("i", range(1, size + 1))
+        for col in range(cols):
+            self.up[col] = size - cols + col if wrap else -1
+            self.down[size - cols + col] = col if wrap else -1
+        for row in range(rows):
+            start = row * cols
+            self.left[start] = start + cols - 1 if wrap else -1
+            self.right[start + cols - 1] = start if wrap else -1
+        self.directions = {"UP": self.up, "DOWN": self.down, "LEFT": self.left, "RIGHT": self.right}
+
+        self.dist = None
+        self.blocked = None
+        self.targets = set()
+        self.synced_tick = None
+        self.tails = []
+        self.rebuild()
+
+    def neighbours(self, index):
+        return self.up[index], self.down[index], self.left[index], self.right[index]
+
+    def is_blocked(self, index):
+        grid = self.engine.grid
+        if grid.occupancy[index]:
+            return True
+        bonus = grid.bonus_at.get(index)
+        return bonus is not None and bonus.kind in OBSTACLE_BONUSES
+
+    def is_target(self, index):
+        bonus = self.engine.grid.bonus_at.get(index)
+        return bonus is not None and bonus.kind in TARGET_BONUSES
+
+    def rebuild(self):
+        engine = self.engine
+        size = engine.grid.size
+        dist = self.dist = array("i", [INF]) * size
+        blocked = self.blocked = bytearray(size)
+        for player in engine.players:
+            if player.alive:
+                for index in player.snake.segments:
+                    blocked[index] = 1
+        self.targets = set()
+        for index, bonus in engine.bonuses.items():
+            if bonus.kind in OBSTACLE_BONUSES:
+                blocked[index] = 1
+            elif bonus.kind in TARGET_BONUSES:
+                self.targets.add(index)
+
+        queue = deque()
+        for index in self.targets:
+            dist[index] = 0
+            queue.append(index)
+        while queue:
+            index = queue.popleft()
+            next_distance = dist[index] + 1
+            for neighbour in self.neighbours(index):
+                if neighbour >= 0 and not blocked[neighbour] and dist[neighbour] == INF:
+                    dist[neighbour] = next_distance
+                    queue.append(neighbour)
+        self.remember_tails()
+        self.synced_tick = engine.ticks
+
+    def remember_tails(self):
+        # За шаг хвост уходит на клетку при ходе и ещё на одну от яда
+        self.tails = []
+        for player in self.engine.players:
+            segments = player.snake.segments
+            if player.alive:
+                self.tails.append(segments[-1])
+                if len(segments) > 1:
+                    self.tails.append(segments[-2])
+
+    def sync(self):
+        engine = self.engine
+        if self.synced_tick == engine.ticks:
+            return
+        if self.synced_tick != engine.ticks - 1:
+            # Пропущенные шаги не восстановить по событиям последнего
+            self.rebuild()
+            return
+
+        cells = set(self.tails)
+        for player in engine.players:
+            if player.alive:
+                cells.add(player.snake.head_index)
+        for event, subject in engine.events:
+            if event == "death":
+                cells.update(subject.snake.segments)
+            else:
+                cells.add(subject.index)
+        self.update(cells)
+        self.remember_tails()
+        self.synced_tick = engine.ticks
+
+    def update(self, cells):
+        raised = []
+        lowered = []
+        for index in cells:
+            blocked = self.is_blocked(index)
+            target = not blocked and self.is_target(index)
+            was_blocked = self.blocked[index]
+            was_target = index in self.targets
+            if blocked == was_blocked and target == was_target:
+                continue
+
+            self.blocked[index] = blocked
+            if target:
+                self.targets.add(index)
+            else:
+                self.targets.discard(index)
+            if (blocked and not was_blocked) or (was_target and not target):
+                raised.append(index)
+            if not blocked:
+                lowered.append(index)
+
+        self.repair(self.invalidate(raised) + lowered)
+
+    def invalidate(self, seeds):
+        dist = self.dist
+        up, down, left, right = self.up, self.down, self.left, self.right
+        invalid = []
+        starts = []
+        for index in seeds:
+            if dist[index] < INF:
+                starts.append((dist[index], index))
+                dist[index] = INF
+                invalid.append(index)
+
+        queue = deque()
+        for distance, index in waves(starts, queue):
+            for neighbour in (up[index], down[index], left[index], right[index]):
+                if neighbour < 0 or dist[neighbour] != distance + 1:
+                    continue
+                # Соседу нужна другая клетка на расстоянии на единицу меньше
+                for other in (up[neighbour], down[neighbour], left[neighbour], right[neighbour]):
+                    if other >= 0 and dist[other] == distance:
+                        break
+                else:
+                    dist[neighbour] = INF
+                    invalid.append(neighbour)
+                    queue.append((distance + 1, neighbour))
+        return invalid
+
+    def repair(self, cells):
+        dist = self.dist
+        blocked = self.blocked
+        up, down, left, right = self.up, self.down, self.left, self.right
+        starts = []
+        for index in cells:
+            if blocked[index]:
+                dist[index] = INF
+                continue
+            if index in self.targets:
+                distance = 0
+            else:
+                distance = min(dist[neighbour] for neighbour in self.neighbours(index) if neighbour >= 0) + 1
+            if distance < dist[index]:
+                dist[index] = distance
+                starts.append((distance, index))
+
+        queue = deque()
+        for distance, index in waves(starts, queue):
+            if distance > dist[index]:
+                continue
+            for neighbour in (up[index], down[index], left[index], right[index]):
+                if neighbour >= 0 and not blocked[neighbour] and distance + 1 < dist[neighbour]:
+                    dist[neighbour] = distance + 1
+                    queue.append((distance + 1, neighbour))
+
+    def distance(self, index):
+        return self.dist[index]
+
+    def free_space(self, start, limit):
+        # Сколько свободных клеток достижимо из start, но не больше limit
+        blocked = self.blocked
+        up, down, left, right = self.up, self.down, self.left, self.right
+        seen = {start}
+        queue = deque((start,))
+        while queue and len(seen) < limit:
+            index = queue.popleft()
+            for neighbour in (up[index], down[index], left[index], right[index]):
+                if neighbour >= 0 and neighbour not in seen and not blocked[neighbour]:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return min(len(seen), limit)
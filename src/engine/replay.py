@@ -0,0 +1,103 @@
+import struct
+import time
+from src.engine.game_engine import GameEngine
+
+MAGIC = b"SNKR"
+VERSION = 1
+# magic, версия, seed, cols, rows, border_mode, число шагов, итоговые очки
+HEADER = struct.Struct("<4sBQHHBIi")
+# Направление и сколько шагов подряд оно держалось
+RUN = struct.Struct("<BI")
+
+DIRECTION_CODES = {"UP": 0, "DOWN": 1, "LEFT": 2, "RIGHT": 3}
+CODE_DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+
+
+# Запись сессии: seed движка и направление змейки на каждом шаге.
+# Направления хранятся сериями, поэтому файл занимает байты, а не шаги.
+class Recorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.runs = []
+        engine.recorder = self
+
+    def record(self, direction):
+        code = DIRECTION_CODES[direction]
+        if self.runs and self.runs[-1][0] == code:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([code, 1])
+
+    def save(self, path):
+        engine = self.engine
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, engine.seed, engine.cols, engine.rows,
+                                   engine.border_mode, engine.ticks, engine.score))
+            for code, count in self.runs:
+                file.write(RUN.pack(code, count))
+
+
+class Replay:
+    def __init__(self, seed, cols, rows, border_mode, runs, ticks=None, score=None):
+        self.seed = seed
+        self.cols = cols
+        self.rows = rows
+        self.border_mode = border_mode
+        self.runs = runs
+        self.ticks = ticks
+        self.score = score
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, version, seed, cols, rows, border_mode, ticks, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported replay file: {path}")
+
+        runs = [RUN.unpack_from(data, offset) for offset in range(HEADER.size, len(data), RUN.size)]
+        return cls(seed, cols, rows, bool(border_mode), runs, ticks, score)
+
+    def create_engine(self):
+        return GameEngine(self.cols, self.rows, self.border_mode, seed=self.seed)
+
+    def directions(self):
+        for code, count in self.runs:
+            direction = CODE_DIRECTIONS[code]
+            for _ in range(count):
+                yield direction
+
+
+# Направление из записи подставляется напрямую, минуя проверки
+# change_direction: в файле уже лежит итоговое направление шага
+class ReplayPlayer:
+    def __init__(self, replay, engine=None):
+        self.replay = replay
+        self.engine = engine if engine is not None else replay.create_engine()
+        self.directions = replay.directions()
+
+    def step(self):
+        direction = next(self.directions, None)
+        if direction is None:
+            return False
+        self.engine.snake.next_direction = direction
+        return self.engine.step()
+
+    def run(self):
+        while self.engine.running and self.step():
+            pass
+        return self.engine
+
+
+def replay_headless(path):
+    replay = Replay.load(path)
+    start = time.perf_counter()
+    engine = ReplayPlayer(replay).run()
+    elapsed = time.perf_counter() - start
+
+    print(f"Replay {path}: {engine.ticks} ticks, score {engine.score}, "
+          f"death: {engine.death_cause}, {engine.ticks / max(elapsed, 1e-9):.0f} ticks/s")
+    if replay.ticks is not None and (engine.ticks, engine.score) != (replay.ticks, replay.score):
+        print(f"Replay diverged: recorded {replay.ticks} ticks, score {replay.score}")
+    return engine
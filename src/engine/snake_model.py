@@ -0,0 +1,130 @@
+from collections import deque
+from itertools import islice
+
+OPPOSITE_DIRECTIONS = {
+    "UP": "DOWN",
+    "DOWN": "UP",
+    "LEFT": "RIGHT",
+    "RIGHT": "LEFT",
+}
+
+
+# Логика змейки без pygame. Тело - deque индексов клеток (голова слева),
+# занятость клеток ведётся в grid.occupancy, поэтому движение, рост,
+# укорачивание и проверка столкновений работают за O(1).
+class SnakeModel:
+    def __init__(self, grid, body=None, direction="RIGHT"):
+        self.grid = grid
+        if body is None:
+            head_col = min(4, grid.cols - 1)
+            head_row = min(4, grid.rows // 2)
+            body = [(head_col - i, head_row) for i in range(3)]
+        self.segments = deque()
+        for cell in body:
+            index = grid.index(cell)
+            self.segments.append(index)
+            grid.occupy(index)
+        self.direction = direction
+        self.next_direction = direction
+        self.inverted_controls = False
+        self.moves = 0
+
+    @property
+    def cols(self):
+        return self.grid.cols
+
+    @property
+    def rows(self):
+        return self.grid.rows
+
+    @property
+    def head_index(self):
+        return self.segments[0]
+
+    @property
+    def head(self):
+        return self.grid.cell(self.segments[0])
+
+    @property
+    def body(self):
+        # Список клеток (col, row) для отрисовки, O(n)
+        cell = self.grid.cell
+        return [cell(index) for index in self.segments]
+
+    def __len__(self):
+        return len(self.segments)
+
+    def change_direction(self, direction):
+        if self.inverted_controls:
+            direction = OPPOSITE_DIRECTIONS[direction]
+
+        if OPPOSITE_DIRECTIONS[direction] != self.direction:
+            self.next_direction = direction
+
+    def move(self, border_mode):
+        new_head = self.next_head(border_mode)
+        if new_head is None:
+            return False
+
+        self.drop_tail()
+        self.push_head(new_head)
+        return True
+
+    # Ход по частям нужен, когда змеек несколько: сначала все освобождают хвосты,
+    # потом все занимают новые клетки, и результат не зависит от порядка змеек
+    def next_head(self, border_mode):
+        self.direction = self.next_direction
+        return self.grid.offset(self.segments[0], self.direction, 1, border_mode)
+
+    def drop_tail(self):
+        self.grid.release(self.segments.pop())
+
+    def push_head(self, index):
+        self.segments.appendleft(index)
+        self.grid.occupy(index)
+        self.moves += 1
+
+    def leave_grid(self):
+        # Погибшая змейка освобождает клетки, сегменты остаются для отрисовки
+        for index in self.segments:
+            self.grid.release(index)
+
+    def grow(self):
+        tail = self.segments[-1]
+        self.segments.append(tail)
+        self.grid.occupy(tail)
+
+    def shrink(self):
+        tail = self.segments.pop()
+        self.grid.release(tail)
+        return self.grid.cell(tail)
+
+    def occupies(self, cell):
+        return self.grid.is_occupied(self.grid.index(cell))
+
+    def check_self_collision(self):
+        return self.grid.occupancy[self.segments[0]] > 1
+
+    def bites_itself(self):
+        # O(n), вызывается только при столкновении, чтобы назвать причину смерти
+        head = self.segments[0]
+        return any(index == head for index in islice(self.segments, 1, None))
+
+
+# Стартовые позиции для нескольких змеек: через строку, по несколько в строке,
+# если строк не хватает. Все смотрят вправо.
+def start_bodies(cols, rows, count):
+    lane_rows = max(rows // 2, 1)
+    per_row = -(-count // lane_rows)
+    used_rows = -(-count // per_row)
+    lane_width = cols // per_row
+    if lane_width < 3:
+        raise ValueError(f"Поле {cols}x{rows} слишком мало для {count} змеек")
+
+    bodies = []
+    for i in range(count):
+        slot, lane = divmod(i, per_row)
+        row = (slot + 1) * rows // (used_rows + 1)
+        head_col = lane * lane_width + min(4, lane_width - 1)
+        bodies.append([(head_col - k, row) for k in range(3)])
+    return bodies
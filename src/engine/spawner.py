@@ -0,0 +1,46 @@
+import heapq
+
+SPAWN = "spawn"
+EXPIRE = "expire"
+
+
+# Очередь событий бонусов: появление каждого типа и исчезновение каждого
+# бонуса по сроку жизни. На шагах, где ничего не наступило, работы нет.
+class SpawnScheduler:
+    def __init__(self, settings):
+        self.settings = settings
+        self.queue = []
+        self.counter = 0
+        for kind in settings:
+            # Первое появление - на первом же шаге
+            self.push(float("-inf"), SPAWN, kind)
+
+    def push(self, due, action, payload):
+        self.counter += 1
+        heapq.heappush(self.queue, (due, self.counter, action, payload))
+
+    def schedule_expiry(self, bonus):
+        self.push(bonus.spawn_time + bonus.lifetime, EXPIRE, bonus)
+
+    def next_due(self):
+        return self.queue[0][0] if self.queue else None
+
+    def pop_due(self, now):
+        # Бонус появляется, когда с прошлого появления прошло строго больше
+        # spawn_interval, и исчезает, когда возраст >= lifetime
+        due_events = []
+        deferred = []
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            entry = heapq.heappop(queue)
+            due, _, action, payload = entry
+            if action == SPAWN:
+                if due == now:
+                    deferred.append(entry)
+                    continue
+                self.push(now + self.settings[payload]["spawn_interval"], SPAWN, payload)
+            due_events.append((action, payload))
+
+        for entry in deferred:
+            heapq.heappush(queue, entry)
+        return due_events
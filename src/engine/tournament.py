@@ -0,0 +1,237 @@
+import argparse
+import csv
+import json
+import os
+import signal
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from config.const import VIEW_CELLS, TOURNAMENT_MAX_TICKS, TOURNAMENT_GAME_TIMEOUT, TOURNAMENT_CHUNK_SIZE
+from src.engine.bots import GreedyBot, RandomBot, ScriptedBot, Autopilot
+from src.engine.cli import board_size
+from src.engine.game_engine import GameEngine
+from src.engine.pathfinding import DistanceField
+
+CONTROLLERS = {
+    "scripted": lambda engine, seed: ScriptedBot(engine, 0),
+    "random": lambda engine, seed: RandomBot(engine, 0, seed),
+    "greedy": lambda engine, seed: GreedyBot(engine, 0),
+    "autopilot": lambda engine, seed: Autopilot(engine, 0, DistanceField(engine)),
+}
+FIELDS = ("controller", "seed", "score", "length", "death_cause", "ticks", "seconds", "error")
+
+
+class GameTimeout(Exception):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise GameTimeout()
+
+
+def play_game(controller, seed, settings):
+    engine = GameEngine(settings["cols"], settings["rows"], settings["border_mode"], seed=seed)
+    bot = CONTROLLERS[controller](engine, seed)
+    while engine.running and engine.ticks < settings["max_ticks"]:
+        engine.step(bot.choose())
+    return {"controller": controller, "seed": seed, "score": engine.score, "length": len(engine.snake),
+            "death_cause": engine.death_cause if not engine.running else "max_ticks", "ticks": engine.ticks}
+
+
+def failed_game(controller, seed, cause, error=None):
+    return {"controller": controller, "seed": seed, "score": None, "length": None,
+            "death_cause": cause, "ticks": None, "error": error}
+
+
+# Выполняется в процессе пула. Зависшая партия прерывается таймером (где есть SIGALRM),
+# упавшая записывается с ошибкой - остальные партии пачки доигрываются.
+def play_chunk(controller, seeds, settings):
+    timer = hasattr(signal, "setitimer") and settings["timeout"] > 0
+    if timer:
+        signal.signal(signal.SIGALRM, raise_timeout)
+    results = []
+    for seed in seeds:
+        start = time.perf_counter()
+        try:
+            if timer:
+                signal.setitimer(signal.ITIMER_REAL, settings["timeout"])
+            result = play_game(controller, seed, settings)
+        except GameTimeout:
+            result = failed_game(controller, seed, "timeout")
+        except Exception as e:
+            result = failed_game(controller, seed, "error", repr(e))
+        finally:
+            if timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        result["seconds"] = round(time.perf_counter() - start, 4)
+        results.append(result)
+    return results
+
+
+# Итоги по контроллеру без хранения самих партий: суммы, максимумы и счётчики
+class Totals:
+    def __init__(self):
+        self.games = 0
+        self.failed = 0
+        self.score_sum = 0
+        self.score_max = 0
+        self.scores = Counter()
+        self.length_sum = 0
+        self.length_max = 0
+        self.ticks_sum = 0
+        self.causes = Counter()
+
+    def add(self, result):
+        self.games += 1
+        self.causes[result["death_cause"]] += 1
+        if result["score"] is None:
+            self.failed += 1
+            return
+        self.score_sum += result["score"]
+        self.score_max = max(self.score_max, result["score"])
+        self.scores[result["score"]] += 1
+        self.length_sum += result["length"]
+        self.length_max = max(self.length_max, result["length"])
+        self.ticks_sum += result["ticks"]
+
+    def median_score(self):
+        played = self.games - self.failed
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen * 2 >= played:
+                return score
+        return 0
+
+    def report(self, name):
+        causes = ", ".join(f"{cause} {count}" for cause, count in self.causes.most_common())
+        played = self.games - self.failed
+        if not played:
+            return f"{name}: {self.games} games, {self.failed} failed, score n/a; {causes}"
+        return (f"{name}: {self.games} games, {self.failed} failed, score mean {self.score_sum / played:.1f} "
+                f"median {self.median_score()} max {self.score_max}, length mean {self.length_sum / played:.1f} "
+                f"max {self.length_max}, ticks mean {self.ticks_sum / played:.0f}; {causes}")
+
+
+class ResultsWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = None
+        if path.endswith(".csv"):
+            self.writer = csv.DictWriter(self.file, FIELDS, delimiter=";", extrasaction="ignore")
+            self.writer.writeheader()
+
+    def write(self, result):
+        if self.writer is not None:
+            self.writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def chunks(controllers, games, seed, chunk_size):
+    # Все контроллеры играют одни и те же партии: seed партии i - seed + i
+    for start in range(0, games, chunk_size):
+        seeds = list(range(seed + start, seed + min(start + chunk_size, games)))
+        for controller in controllers:
+            yield controller, seeds, 0
+
+
+# Пачки партий раздаются пулу процессов с ограниченной очередью, результаты пишутся
+# по мере готовности. Если процесс пула погиб, недоигранные пачки повторяются по одной
+# партии в новом пуле и поодиночке; партия, уронившая пул и при повторе, записывается как "crash".
+def run_tournament(args, settings, on_result):
+    tasks = chunks(args.controllers, args.games, args.seed, args.chunk_size)
+    retries = deque()
+    max_pending = args.jobs * 4
+    while True:
+        pending = {}
+        broken = False
+        with ProcessPoolExecutor(args.jobs) as executor:
+            while True:
+                while not broken and len(pending) < max_pending:
+                    if retries:
+                        # Повтор идёт в пуле один, чтобы падение задело только его
+                        if not pending:
+                            task = retries.popleft()
+                            pending[executor.submit(play_chunk, task[0], task[1], settings)] = task
+                        break
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    pending[executor.submit(play_chunk, task[0], task[1], settings)] = task
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    controller, seeds, attempt = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        for seed in seeds:
+                            if attempt >= 1:
+                                on_result(dict(failed_game(controller, seed, "crash"), seconds=None))
+                            else:
+                                retries.append((controller, [seed], attempt + 1))
+                        continue
+                    for result in results:
+                        on_result(result)
+                if broken and not pending:
+                    break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games with bots on all cores")
+    parser.add_argument("--games", type=int, default=1000, help="games per controller")
+    parser.add_argument("--controllers", nargs="+", choices=list(CONTROLLERS), default=["greedy"])
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, the next ones follow")
+    parser.add_argument("--board", type=board_size, default=VIEW_CELLS, metavar="COLSxROWS")
+    parser.add_argument("--no-borders", action="store_true", help="wrap around the board edges")
+    parser.add_argument("--max-ticks", type=int, default=TOURNAMENT_MAX_TICKS, help="end a game after this many ticks")
+    parser.add_argument("--timeout", type=float, default=TOURNAMENT_GAME_TIMEOUT,
+                        help="seconds before a game is abandoned, 0 to disable")
+    parser.add_argument("--chunk-size", type=int, default=TOURNAMENT_CHUNK_SIZE, help="games sent to a worker at once")
+    parser.add_argument("--output", default="tournament_results.jsonl",
+                        help="per-game results as JSON lines (or CSV for *.csv)")
+    args = parser.parse_args()
+    if args.games < 1 or args.jobs < 1 or args.chunk_size < 1:
+        parser.error("--games, --jobs and --chunk-size must be positive")
+
+    settings = {"cols": args.board[0], "rows": args.board[1], "border_mode": not args.no_borders,
+                "max_ticks": args.max_ticks, "timeout": args.timeout}
+    totals = {controller: Totals() for controller in args.controllers}
+    writer = ResultsWriter(args.output)
+    total_games = args.games * len(args.controllers)
+    finished = 0
+    start = time.perf_counter()
+
+    def on_result(result):
+        nonlocal finished
+        writer.write(result)
+        totals[result["controller"]].add(result)
+        finished += 1
+        if finished % max(total_games // 10, 1) == 0:
+            print(f"{finished}/{total_games} games, {finished / (time.perf_counter() - start):.0f} games/s")
+
+    try:
+        run_tournament(args, settings, on_result)
+    except KeyboardInterrupt:
+        print("Interrupted, results so far:")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{finished} games in {elapsed:.1f}s on {args.jobs} processes, {finished / elapsed:.1f} games/s")
+    for controller, controller_totals in totals.items():
+        print(controller_totals.report(controller))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import threading
+import time
+import pygame
+from collections import OrderedDict
+from config.const import (
+    VIEW_CELLS,
+    MIN_CELL_SIZE,
+    BACKGROUND_TILE_CELLS,
+    TEXT_CACHE_SIZE,
+    SNAKE_IMAGES,
+    BACKGROUND_IMAGE,
+    FOOD_IMAGE,
+    POISONED_FOOD_IMAGE,
+    BOMB_IMAGE,
+    SPEEDUP_IMAGE,
+    CLOCK_IMAGE,
+    DOUBLE_POINTS_IMAGE,
+    INVERTED_CONTROLS_IMAGE,
+    SOUND_ICON_ON,
+    SOUND_ICON_OFF,
+    FLAG_ICON_EN,
+    FLAG_ICON_RU
+)
+
+BONUS_IMAGES = (FOOD_IMAGE, POISONED_FOOD_IMAGE, BOMB_IMAGE, SPEEDUP_IMAGE,
+                CLOCK_IMAGE, DOUBLE_POINTS_IMAGE, INVERTED_CONTROLS_IMAGE)
+ICON_IMAGES = (SOUND_ICON_ON, SOUND_ICON_OFF, FLAG_ICON_EN, FLAG_ICON_RU)
+HELP_ICON_SIZE = (40, 40)
+
+# Общий для всего процесса кэш изображений: (путь, размер, alpha, tint) -> Surface.
+# Поверхности общие, изменять их после загрузки нельзя. Размер клетки целый и ограничен
+# окном, поэтому вариантов после изменения размера окна немного и они переиспользуются.
+_images = {}
+_fonts = {}
+_texts = OrderedDict()
+# Декодированные фоновым потоком файлы, ещё не переведённые в формат экрана
+_decoded = {}
+
+
+def load_image(path, size=None, alpha=True, tint=None):
+    key = (path, size, alpha, tint)
+    image = _images.get(key)
+    if image is None:
+        if tint is not None:
+            # Окрашенный вариант - копия исходного, умноженная на цвет
+            image = load_image(path, size, alpha).copy()
+            image.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+        elif size is None:
+            image = _decoded.pop(path, None)
+            if image is None:
+                image = pygame.image.load(path)
+            image = image.convert_alpha() if alpha else image.convert()
+        else:
+            image = pygame.transform.scale(load_image(path, alpha=alpha), size)
+        _images[key] = image
+    return image
+
+
+def get_font(size, name=None):
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+# Кэш отрендеренных строк с вытеснением давно не использованных (LRU)
+def render_text(text, size, color, name=None):
+    key = (name, size, text, tuple(color))
+    surface = _texts.get(key)
+    if surface is None:
+        surface = get_font(size, name).render(text, True, color)
+        _texts[key] = surface
+        if len(_texts) > TEXT_CACHE_SIZE:
+            _texts.popitem(last=False)
+    else:
+        _texts.move_to_end(key)
+    return surface
+
+
+def cell_size_for(screen_size):
+    return max(min(screen_size[0] // VIEW_CELLS[0], screen_size[1] // VIEW_CELLS[1]), MIN_CELL_SIZE)
+
+
+# Фон собирается из плиток, кратных клетке, вместо растягивания картинки на всё окно
+def background_tile(cell_size):
+    tile = cell_size * BACKGROUND_TILE_CELLS
+    return load_image(BACKGROUND_IMAGE, (tile, tile), alpha=False)
+
+
+# Декодирование png - самая долгая часть загрузки и не требует основного потока,
+# поэтому картинки игры декодируются в фоне, пока показывается меню. Перевод в формат
+# экрана и масштабирование остаются в основном потоке при первом load_image.
+def prefetch(on_done=None):
+    thread = threading.Thread(target=_decode_images, args=(on_done,), daemon=True)
+    thread.start()
+    return thread
+
+
+def _decode_images(on_done):
+    began = time.perf_counter()
+    for path in (*SNAKE_IMAGES.values(), *BONUS_IMAGES, *ICON_IMAGES, BACKGROUND_IMAGE):
+        loaded = (path, None, True, None) in _images or (path, None, False, None) in _images
+        if not loaded and path not in _decoded:
+            try:
+                _decoded[path] = pygame.image.load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                # Основной поток ещё раз попробует загрузить файл и покажет ошибку сам
+                print(f"Error while prefetching {path}: {e}")
+    if on_done is not None:
+        on_done(began)
+
+
+def clear():
+    _images.clear()
+    _decoded.clear()
+    _fonts.clear()
+    _texts.clear()
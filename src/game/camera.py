@@ -0,0 +1,116 @@
+import pygame
+
+
+# Камера над полем: x, y - пиксель мира в левом верхнем углу окна.
+# Поле больше окна прокручивается за головой змейки, поле меньше окна рисуется по центру.
+# Отрисовка обходит только видимые клетки, поэтому её стоимость зависит от окна, а не от поля.
+class Camera:
+    def __init__(self, view_width, view_height, cell_size, grid):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.cell_size = cell_size
+        self.grid = grid
+        self.board_width = grid.cols * cell_size
+        self.board_height = grid.rows * cell_size
+        self.origin_x = max((view_width - self.board_width) // 2, 0)
+        self.origin_y = max((view_height - self.board_height) // 2, 0)
+        self.max_x = max(self.board_width - view_width, 0)
+        self.max_y = max(self.board_height - view_height, 0)
+        # Пока голова внутри центральной зоны, камера стоит на месте
+        self.margin_x = view_width // 4
+        self.margin_y = view_height // 4
+        self.x = 0
+        self.y = 0
+        self.tiled = None
+        self.tiled_source = None
+
+    @property
+    def offset(self):
+        # screen = world - offset
+        return self.x - self.origin_x, self.y - self.origin_y
+
+    @property
+    def scrolls(self):
+        return self.max_x > 0 or self.max_y > 0
+
+    def follow(self, cell):
+        # Возвращает True, если камера сдвинулась
+        if not self.scrolls:
+            return False
+
+        head_x = cell[0] * self.cell_size
+        head_y = cell[1] * self.cell_size
+        x = min(max(self.x, head_x + self.cell_size + self.margin_x - self.view_width), head_x - self.margin_x)
+        y = min(max(self.y, head_y + self.cell_size + self.margin_y - self.view_height), head_y - self.margin_y)
+        x = min(max(x, 0), self.max_x)
+        y = min(max(y, 0), self.max_y)
+        if x == self.x and y == self.y:
+            return False
+
+        self.x = x
+        self.y = y
+        return True
+
+    def visible_range(self):
+        # Видимые столбцы и строки: range по col и по row
+        cell_size = self.cell_size
+        return (range(self.x // cell_size,
+                      min((self.x + self.view_width - 1) // cell_size + 1, self.grid.cols)),
+                range(self.y // cell_size,
+                      min((self.y + self.view_height - 1) // cell_size + 1, self.grid.rows)))
+
+    def visible_cells(self):
+        cols = self.grid.cols
+        col_range, row_range = self.visible_range()
+        for row in row_range:
+            start = row * cols
+            for col in col_range:
+                yield start + col
+
+    def is_visible(self, index):
+        col_range, row_range = self.visible_range()
+        col, row = self.grid.cell(index)
+        return col in col_range and row in row_range
+
+    def cell_rect(self, index):
+        col, row = self.grid.cell(index)
+        offset_x, offset_y = self.offset
+        return pygame.Rect(col * self.cell_size - offset_x, row * self.cell_size - offset_y,
+                           self.cell_size, self.cell_size)
+
+    def cells_under(self, rect):
+        # Видимые клетки под прямоугольником в координатах окна
+        cell_size = self.cell_size
+        offset_x, offset_y = self.offset
+        col_range, row_range = self.visible_range()
+        cols = self.grid.cols
+        cells = []
+        for row in range(max((rect.top + offset_y) // cell_size, row_range.start),
+                         min((rect.bottom - 1 + offset_y) // cell_size + 1, row_range.stop)):
+            for col in range(max((rect.left + offset_x) // cell_size, col_range.start),
+                             min((rect.right - 1 + offset_x) // cell_size + 1, col_range.stop)):
+                cells.append(row * cols + col)
+        return cells
+
+    def compose_background(self, tile, surface=None):
+        # Фон окна под текущим положением камеры: плитка повторяется по полю,
+        # вне поля - тёмная заливка. Пересобирается только при сдвиге камеры,
+        # одним blit из заранее замощённой поверхности на плитку больше окна.
+        width, height = tile.get_size()
+        if self.tiled_source is not tile:
+            self.tiled = pygame.Surface((self.view_width + width, self.view_height + height)).convert()
+            for top in range(0, self.tiled.get_height(), height):
+                for left in range(0, self.tiled.get_width(), width):
+                    self.tiled.blit(tile, (left, top))
+            self.tiled_source = tile
+
+        if surface is None:
+            surface = pygame.Surface((self.view_width, self.view_height)).convert()
+        surface.fill((20, 20, 20))
+
+        offset_x, offset_y = self.offset
+        board_rect = pygame.Rect(-offset_x, -offset_y, self.board_width, self.board_height)
+        surface.set_clip(board_rect.clip(surface.get_rect()))
+        surface.blit(self.tiled, (self.origin_x - self.x % width, self.origin_y - self.y % height))
+        surface.set_clip(None)
+        return surface
@@ -1,245 +1,412 @@
 import pygame
 import sys
-import json
 import time
-from config.const import CELL_SIZE, GAME_SPEED, LOCALE_FILENAME, BACKGROUND_IMAGE
+from config.const import (
+    VIEW_CELLS,
+    BOARD_SIZE,
+    DIRTY_RENDERING,
+    RENDER_FPS,
+    MAX_TICKS_PER_FRAME,
+    INTERPOLATE_MOTION,
+    SNAKE_COLORS
+)
+from config.locale_work import get_texts
+from src.engine.game_engine import GameEngine
+from src.engine.replay import Recorder, ReplayPlayer
+from src.engine.bots import Autopilot
+from src.engine.pathfinding import DistanceField
 from src.game.snake import Snake
-from src.game.game_objects import Food, PoisonedFood, Bomb, Speedup, Clock, DoublePoints, InvertedControls
+from src.game.camera import Camera
+from src.game.game_objects import BONUS_SPRITES
+from src.game.assets import get_font, render_text, cell_size_for, background_tile
+from src.game.window import window_resized
+from src.game.profiler import FrameProfiler
 from src.ui.death_window import DeathWindow
 from src.ui.pause_menu import PauseMenu
-from config.scores_work import update_best_score
+from config.scores_work import update_best_score_async
+
+# Управление игроков: стрелки у первого, WASD у второго
+KEY_BINDINGS = (
+    {pygame.K_UP: "UP", pygame.K_DOWN: "DOWN", pygame.K_LEFT: "LEFT", pygame.K_RIGHT: "RIGHT"},
+    {pygame.K_w: "UP", pygame.K_s: "DOWN", pygame.K_a: "LEFT", pygame.K_d: "RIGHT"},
+)
 
 
 class Game:
-    def __init__(self, screen_width, screen_height, language="en", border_mode=True):
+    def __init__(self, screen_width, screen_height, language="en", border_mode=True,
+                 dirty_rendering=DIRTY_RENDERING, interpolate=INTERPOLATE_MOTION,
+                 record_path=None, replay=None, show_profiler=False, profile_trace=None,
+                 board_size=BOARD_SIZE, players=1, bots=0, autopilot=False):
         self.border_mode = border_mode
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.cell_size = CELL_SIZE
-        self.running = True
+        self.cell_size = cell_size_for((screen_width, screen_height))
         self.clock = pygame.time.Clock()
-        self.snake = Snake(
-            self.cell_size, self.screen_width, self.screen_height)
-        self.score = 0
+        self.replay_player = None
+        self.recorder = None
+        self.record_path = record_path
+        if replay is not None:
+            self.replay_player = ReplayPlayer(replay)
+            self.engine = self.replay_player.engine
+        else:
+            if board_size is None:
+                board_size = VIEW_CELLS
+            self.engine = GameEngine(board_size[0], board_size[1], border_mode, snake_count=players + bots)
+            if record_path is not None and players + bots > 1:
+                # В запись попадает только управление первой змейки
+                print("Recording is only supported for single-player games, not recording")
+                self.record_path = None
+            elif record_path is not None:
+                self.recorder = Recorder(self.engine)
+        # Змейки и боты идут подряд: сначала игроки, потом боты
+        self.human_count = players if replay is None else 1
+        # В демо-режиме первой змейкой тоже управляет автопилот
+        self.autopilot = autopilot and replay is None
+        self.bots = []
+        if replay is None and (self.autopilot or len(self.engine.players) > self.human_count):
+            field = DistanceField(self.engine)
+            first = 0 if self.autopilot else self.human_count
+            self.bots = [Autopilot(self.engine, number, field) for number in range(first, len(self.engine.players))]
+        self.snake_cells = {}
+        self.snake_dirty_cells = set()
+        self.snakes = [
+            Snake(self.cell_size, player.snake, SNAKE_COLORS[player.number - 1] if player.number else None,
+                  self.snake_cells, self.snake_dirty_cells)
+            for player in self.engine.players
+        ]
+        self.snake = self.snakes[0]
+        self.camera = Camera(screen_width, screen_height, self.cell_size, self.engine.grid)
+        self.camera.follow(self.followed_snake().head)
+        self.show_profiler = show_profiler
+        self.profile_trace = profile_trace
+        self.profiler = None
+        self.profiler_surfaces = []
+        self.profiler_frames = 0
+        if show_profiler or profile_trace:
+            self.attach_profiler()
         self.language = language
         self.texts = self.load_locale()
-        self.font = pygame.font.Font(None, 36)
-        self.active_effects = []
+        self.font = get_font(36)
         self.bonus_objects = pygame.sprite.Group()
-        self.game_speed = GAME_SPEED
-        self.score_multiplier = 1
-        self.last_spawn_time = {}
+        self.bonus_sprites = {}
         self.pause_menu = PauseMenu(screen_width, screen_height, language)
         self.paused = False
-
-        self.background = pygame.image.load(BACKGROUND_IMAGE).convert()
-        self.background = pygame.transform.scale(
-            self.background, (self.screen_width, self.screen_height)
-        )
+        self.dirty_rendering = dirty_rendering and not interpolate
+        self.interpolate = interpolate
+        self.full_redraw = True
+        self.dirty_cells = set()
+        self.hud_state = None
+        self.hud_rects = []
+        self.hud_cache = (None, [])
+
+        self.background = background_tile(self.cell_size)
+        self.view_background = self.camera.compose_background(self.background)
+        self.background_offset = self.camera.offset
+
+    @property
+    def running(self):
+        return self.engine.running
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def game_speed(self):
+        return self.engine.game_speed
+
+    @property
+    def active_effects(self):
+        return self.engine.effects
 
     def load_locale(self):
-        with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
-            localization_data = json.load(file)
-            return localization_data[self.language]
+        return get_texts(self.language)
+
+    def followed_snake(self):
+        # Камера следит за первым живым игроком
+        for player in self.engine.players[:self.human_count]:
+            if player.alive:
+                return player.snake
+        return self.engine.snake
+
+    def resize(self, screen_width, screen_height):
+        # Спрайты берутся из кэша вариантов по размеру клетки, поэтому повторный
+        # переход к уже встречавшемуся размеру ничего не масштабирует
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.cell_size = cell_size_for((screen_width, screen_height))
+        for player, snake in zip(self.engine.players, self.snakes):
+            snake.cell_size = self.cell_size
+            if player.alive:
+                snake.set_cell_size(self.cell_size)
+        self.bonus_objects.empty()
+        self.bonus_sprites.clear()
+        for bonus in self.engine.bonuses.values():
+            self.add_bonus_sprite(bonus)
+
+        self.camera = Camera(screen_width, screen_height, self.cell_size, self.engine.grid)
+        self.camera.follow(self.followed_snake().head)
+        self.background = background_tile(self.cell_size)
+        self.view_background = self.camera.compose_background(self.background)
+        self.background_offset = self.camera.offset
+
+        self.pause_menu.resize(screen_width, screen_height)
+        self.hud_cache = (None, [])
+        self.hud_state = None
+        self.hud_rects = []
+        self.dirty_cells.clear()
+        self.snake_dirty_cells.clear()
+        self.full_redraw = True
 
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            size = window_resized(event)
+            if size is not None:
+                self.resize(*size)
+            elif event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.snake.change_direction("UP")
-                elif event.key == pygame.K_DOWN:
-                    self.snake.change_direction("DOWN")
-                elif event.key == pygame.K_LEFT:
-                    self.snake.change_direction("LEFT")
-                elif event.key == pygame.K_RIGHT:
-                    self.snake.change_direction("RIGHT")
-                elif event.key == pygame.K_p or event.unicode.lower() == 'з':
-                    self.paused = not self.paused
-
-    def spawn_bonus(self, bonus_class):
-        max_count = bonus_class(
-            self.cell_size, self.screen_width, self.screen_height).max_count
-        if len([obj for obj in self.bonus_objects if isinstance(obj, bonus_class)]) < max_count:
-            for _ in range(3):
-                new_bonus = bonus_class(
-                    self.cell_size, self.screen_width, self.screen_height)
-
-                if any(new_bonus.rect.colliderect(obj.rect) for obj in self.bonus_objects):
-                    continue
-
-                new_bonus_pos = new_bonus.rect.topleft
-                if any(new_bonus_pos == body_pos for body_pos in self.snake.body):
+                bound = False
+                for number, bindings in enumerate(KEY_BINDINGS[:self.human_count]):
+                    direction = bindings.get(event.key)
+                    if direction is not None:
+                        bound = True
+                        # Во время повтора управление берётся из записи
+                        if self.replay_player is None:
+                            self.engine.change_direction(direction, number)
+                if bound:
                     continue
-
-                if bonus_class == Bomb:
-                    snake_head = self.snake.body[0]
-                    snake_direction = self.snake.direction
-                    next_positions = [
-                        (snake_head[0] + self.cell_size * i, snake_head[1]) if snake_direction == "RIGHT" else
-                        (snake_head[0] - self.cell_size * i, snake_head[1]) if snake_direction == "LEFT" else
-                        (snake_head[0], snake_head[1] - self.cell_size * i) if snake_direction == "UP" else
-                        (snake_head[0], snake_head[1] + self.cell_size * i)
-                        for i in range(1, 6)
-                    ]
-                    if any(new_bonus.rect.topleft == pos for pos in next_positions):
-                        continue
-
-                self.bonus_objects.add(new_bonus)
-                break
+                if event.key == pygame.K_p or event.unicode.lower() == 'з':
+                    self.paused = not self.paused
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+
+    def attach_profiler(self):
+        self.profiler = FrameProfiler(keep_trace=self.profile_trace is not None)
+        self.engine.profiler = self.profiler
+
+    def toggle_profiler(self):
+        # Без оверлея и записи трассы профилировщик отключается полностью
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and self.profiler is None:
+            self.attach_profiler()
+        elif not self.show_profiler and self.profile_trace is None:
+            self.profiler = None
+            self.engine.profiler = None
+        self.full_redraw = True
 
     def update(self):
-        if not self.snake.move(border_mode=self.border_mode):
-            self.running = False
-        current_time = time.time()
-
-        self.spawn_food(current_time)
-        self.delete_old_food(current_time)
-        self.handle_collisions()
-        self.update_active_effects(current_time)
-
-    def spawn_food(self, current_time):
-        for bonus_class in [Food, PoisonedFood, Bomb, Speedup, Clock, DoublePoints, InvertedControls]:
-            if bonus_class not in self.last_spawn_time:
-                self.last_spawn_time[bonus_class] = 0
-
-            spawn_interval = bonus_class(
-                self.cell_size, self.screen_width, self.screen_height).spawn_interval
-            if current_time - self.last_spawn_time[bonus_class] > spawn_interval:
-                self.spawn_bonus(bonus_class)
-                self.last_spawn_time[bonus_class] = current_time
-
-    def delete_old_food(self, current_time):
-        for obj in list(self.bonus_objects):
-            if current_time - obj.spawn_time >= obj.lifetime:
-                self.bonus_objects.remove(obj)
-
-    def handle_collisions(self):
-        collided_objects = pygame.sprite.spritecollide(
-            self.snake, self.bonus_objects, dokill=True
-        )
-        for obj in collided_objects:
-            if isinstance(obj, PoisonedFood):
-                if len(self.snake.body) > 1:
-                    removed_segment = self.snake.body.pop()
-                    for sprite in self.snake.body_sprites:
-                        if sprite.rect.topleft == removed_segment:
-                            self.snake.body_sprites.remove(sprite)
-                            break
-                elif len(self.snake.body) == 1:
-                    self.running = False
-                if self.score < 8:
-                    self.score = 0
-                    self.running = False
+        if self.replay_player is not None:
+            if not self.replay_player.step() and self.engine.running:
+                self.engine.end_game("replay_end")
+        else:
+            for bot in self.bots:
+                if bot.player.alive:
+                    self.engine.change_direction(bot.choose(), bot.number)
+            self.engine.step()
+            humans = self.engine.players[:self.human_count]
+            if self.engine.running and not any(player.alive for player in humans):
+                self.engine.end_game(humans[0].death_cause)
+        self.sync_sprites()
+        if self.profiler is not None:
+            self.profiler.lap("sync_sprites")
+
+    def sync_sprites(self):
+        for event, subject in self.engine.events:
+            if event == "death":
+                # Погибшие змейки исчезают с поля, кроме последнего кадра одиночной игры
+                if self.engine.running or len(self.snakes) > 1:
+                    self.snakes[subject.number].remove_sprites()
+                continue
+            if event == "spawn":
+                self.add_bonus_sprite(subject)
+            else:
+                sprite = self.bonus_sprites.pop(subject, None)
+                if sprite is not None:
+                    self.bonus_objects.remove(sprite)
+            self.dirty_cells.add(subject.index)
+
+        for player, snake in zip(self.engine.players, self.snakes):
+            if player.alive:
+                snake.update_sprites()
+        if self.camera.follow(self.followed_snake().head):
+            # Сдвиг камеры смещает все клетки окна
+            self.full_redraw = True
+
+    def add_bonus_sprite(self, bonus):
+        sprite = BONUS_SPRITES[bonus.kind](self.cell_size, bonus)
+        self.bonus_sprites[bonus] = sprite
+        self.bonus_objects.add(sprite)
+
+    def render(self, screen, alpha=1.0):
+        # Возвращает список изменённых прямоугольников или None, если перерисован весь экран.
+        # alpha - доля текущего шага логики, прошедшая к моменту кадра
+        if self.dirty_rendering and not self.full_redraw:
+            return self.render_dirty(screen)
+
+        camera = self.camera
+        if camera.offset != self.background_offset:
+            self.view_background = camera.compose_background(self.background, self.view_background)
+            self.background_offset = camera.offset
+        screen.blit(self.view_background, (0, 0))
+
+        # Рисуются только спрайты в видимых клетках
+        offset_x, offset_y = camera.offset
+        bonus_at = self.engine.grid.bonus_at
+        bonus_sprites = self.bonus_sprites
+        cell_sprites = self.snake_cells
+        for index in camera.visible_cells():
+            bonus = bonus_at.get(index)
+            if bonus is not None and bonus in bonus_sprites:
+                sprite = bonus_sprites[bonus]
+                screen.blit(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+            for sprite in cell_sprites.get(index, ()):
+                rect = sprite.owner.interpolated_rect(sprite, alpha) if self.interpolate else sprite.rect
+                screen.blit(sprite.image, (rect.x - offset_x, rect.y - offset_y))
+
+        hud = self.render_hud()
+        for surface, rect in hud:
+            screen.blit(surface, rect)
+
+        self.hud_state = self.get_hud_state()
+        self.hud_rects = [rect for _, rect in hud]
+        self.dirty_cells.clear()
+        self.snake_dirty_cells.clear()
+        self.full_redraw = False
+        return None
+
+    def get_hud_state(self):
+        humans = self.engine.players[:self.human_count]
+        return (tuple(player.score for player in humans),
+                tuple(tuple(effect for effect, _ in player.effects) for player in humans))
+
+    def render_hud(self):
+        # HUD перерисовывается только при изменении очков или списка эффектов
+        hud_state = self.get_hud_state()
+        if self.hud_cache[0] == hud_state:
+            return self.hud_cache[1]
+
+        hud = []
+        for number, score in enumerate(hud_state[0]):
+            if self.human_count > 1:
+                score_text = f"{self.texts['score_label']} {number + 1}: {score:04}"
+            else:
+                score_text = f"{self.texts['score_label']}: {score:04}"
+            score_surface = render_text(score_text, 36, (255, 255, 255))
+            score_rect = score_surface.get_rect(
+                topright=(self.screen_width - 10, 10 + 30 * number))
+            hud.append((score_surface, score_rect))
+
+        # Эффекты первого игрока - в левом нижнем углу, второго - в правом
+        for number, effects in enumerate(hud_state[1]):
+            y_offset = self.screen_height - 20
+            for effect in effects:
+                text = self.texts["effects"][effect.value]
+                if self.human_count > 1:
+                    text = f"{number + 1}: {text}"
+                effect_text = render_text(text, 24, (255, 255, 255))
+                if number == 0:
+                    rect = effect_text.get_rect(topleft=(10, y_offset))
                 else:
-                    self.score -= 8
-
-            elif isinstance(obj, Bomb):
-                self.running = False
-            elif isinstance(obj, Speedup):
-                self.remove_effect(self.texts["effects"]["speed_boost"])
-                self.remove_effect(self.texts["effects"]["slow_down"])
-                self.active_effects.append((self.texts["effects"]["speed_boost"], time.time() + 15))
-                self.game_speed = GAME_SPEED * 2
-                self.score += 3 * self.score_multiplier
-            elif isinstance(obj, Clock):
-                self.remove_effect(self.texts["effects"]["speed_boost"])
-                self.remove_effect(self.texts["effects"]["slow_down"])
-                self.active_effects.append((self.texts["effects"]["slow_down"], time.time() + 15))
-                self.game_speed = GAME_SPEED // 1.5
-                self.score += 3 * self.score_multiplier
-            elif isinstance(obj, DoublePoints):
-                self.remove_effect(self.texts["effects"]["double_points"])
-                self.active_effects.append((self.texts["effects"]["double_points"], time.time() + 60))
-                self.score_multiplier = 2
-                self.score += 5 * self.score_multiplier
-            elif isinstance(obj, InvertedControls):
-                self.remove_effect(self.texts["effects"]["inverted_controls"])
-                self.active_effects.append(
-                    (self.texts["effects"]["inverted_controls"], time.time() + 15))
-                self.snake.inverted_controls = True
-                self.score += 9 * self.score_multiplier
-            elif isinstance(obj, Food):
-                self.snake.grow()
-                self.score += 10 * self.score_multiplier
-
-        if not any(isinstance(obj, Food) for obj in self.bonus_objects):
-            self.spawn_bonus(Food)
-
-        if self.snake.check_self_collision():
-            self.running = False
-
-    def remove_effect(self, effect_name):
-        self.active_effects = [
-            effect for effect in self.active_effects
-            if effect[0] != effect_name
-        ]
-
-    def update_active_effects(self, current_time):
-        self.active_effects = [
-            effect for effect in self.active_effects if effect[1] > current_time
-        ]
-        if not any(effect[0] in [self.texts["effects"]["speed_boost"], 
-                                self.texts["effects"]["slow_down"]] 
-                for effect in self.active_effects):
-            self.game_speed = GAME_SPEED
-        if not any(effect[0] == self.texts["effects"]["double_points"] 
-                for effect in self.active_effects):
-            self.score_multiplier = 1
-        if not any(effect[0] == self.texts["effects"]["inverted_controls"] 
-                for effect in self.active_effects):
-            self.snake.inverted_controls = False
-
-    def render(self, screen):
-        screen.blit(self.background, (0, 0))
-
-        self.bonus_objects.draw(screen)
-        self.snake.body_sprites.draw(screen)
-
-        score_text = f"{self.texts['score_label']}: {self.score:04}"
-        score_surface = self.font.render(score_text, True, (255, 255, 255))
-        score_rect = score_surface.get_rect(
-            topright=(self.screen_width - 10, 10))
-        screen.blit(score_surface, score_rect)
-
-        effect_font = pygame.font.Font(None, 24)
-        y_offset = self.screen_height - 20
-        for effect in self.active_effects:
-            effect_text = effect_font.render(effect[0], True, (255, 255, 255))
-            screen.blit(effect_text, (10, y_offset))
-            y_offset -= 20
-
-    def run(self, screen):
-        while self.running:
-            if self.paused:
-                events = pygame.event.get()
-                action = self.pause_menu.handle_events(events)
-                if action == "resume":
-                    self.paused = False
-                elif action == "menu":
-                    return "menu"
-
-                self.pause_menu.render(screen)
-                pygame.display.flip()
-                self.clock.tick(10)
+                    rect = effect_text.get_rect(topright=(self.screen_width - 10, y_offset))
+                hud.append((effect_text, rect))
+                y_offset -= 20
+
+        self.hud_cache = (hud_state, hud)
+        return hud
+
+    def render_dirty(self, screen):
+        dirty_cells = self.dirty_cells | self.snake_dirty_cells
+        self.dirty_cells.clear()
+        self.snake_dirty_cells.clear()
+
+        hud_state = self.get_hud_state()
+        redraw_hud = hud_state != self.hud_state
+        if not redraw_hud:
+            for rect in self.hud_rects:
+                if any(index in dirty_cells for index in self.camera.cells_under(rect)):
+                    redraw_hud = True
+                    break
+
+        camera = self.camera
+        bonus_at = self.engine.grid.bonus_at
+        dirty_rects = []
+        hud = []
+        if redraw_hud:
+            hud = self.render_hud()
+            # Текст рисуется поверх клеток, поэтому под старым и новым HUD клетки восстанавливаются целиком.
+            # Поле меньше окна не закрывает края, и там под текстом восстанавливается фон окна
+            for rect in self.hud_rects + [rect for _, rect in hud]:
+                screen.blit(self.view_background, rect, rect)
+                dirty_rects.append(rect)
+                dirty_cells.update(camera.cells_under(rect))
+
+        for index in dirty_cells:
+            if not camera.is_visible(index):
                 continue
-
-            self.handle_events()
-            self.update()
-            self.render(screen)
+            rect = camera.cell_rect(index)
+            screen.blit(self.view_background, rect, rect)
+
+            bonus = bonus_at.get(index)
+            if bonus is not None and bonus in self.bonus_sprites:
+                screen.blit(self.bonus_sprites[bonus].image, rect)
+            for sprite in self.snake_cells.get(index, ()):
+                screen.blit(sprite.image, rect)
+            dirty_rects.append(rect)
+
+        if redraw_hud:
+            for surface, rect in hud:
+                screen.blit(surface, rect)
+                dirty_rects.append(rect)
+            self.hud_state = hud_state
+            self.hud_rects = [rect for _, rect in hud]
+
+        return dirty_rects
+
+    def render_profiler(self, screen):
+        profiler = self.profiler
+        # Подписи пересоздаются раз в 15 кадров, чтобы оверлей сам не грузил кадр.
+        # Свой счётчик: длина истории после заполнения больше не меняется
+        self.profiler_frames += 1
+        if not self.profiler_surfaces or self.profiler_frames % 15 == 0:
+            font = get_font(20)
+            lines = [f"{'section':<14} {'p50':>7} {'p95':>7} {'p99':>7} ms"]
+            for name, (p50, p95, p99) in profiler.summary():
+                lines.append(f"{name:<14} {p50:7.2f} {p95:7.2f} {p99:7.2f}")
+            self.profiler_surfaces = [font.render(line, True, (255, 255, 0)) for line in lines]
+
+        width = max(surface.get_width() for surface in self.profiler_surfaces) + 20
+        panel = pygame.Surface((width, 16 * len(self.profiler_surfaces) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        screen.blit(panel, (5, 5))
+        for i, surface in enumerate(self.profiler_surfaces):
+            screen.blit(surface, (15, 10 + 16 * i))
+
+    def present(self, dirty_rects):
+        if dirty_rects is None:
             pygame.display.flip()
-            self.clock.tick(self.game_speed)
-
-        update_best_score(self.snake.username, self.score)
+        else:
+            pygame.display.update(dirty_rects)
 
+    def run(self, screen):
+        # Запись и трасса сохраняются и при выходе из паузы в меню или закрытии окна посреди игры
+        try:
+            if self.play(screen) == "menu":
+                return "menu"
+        finally:
+            self.save_session()
+        if self.replay_player is None and not self.autopilot:
+            update_best_score_async(self.snake.username, self.score)
         death_window = DeathWindow(
             self.screen_width, self.screen_height, self.score, self.language)
         while True:
             events = pygame.event.get()
             for event in events:
-                if event.type == pygame.QUIT:
+                size = window_resized(event)
+                if size is not None:
+                    death_window.resize(*size)
+                elif event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
@@ -251,3 +418,75 @@ class Game:
 
             death_window.render(screen)
             pygame.display.flip()
+
+    def play(self, screen):
+        # Фиксированный шаг логики: скорость змейки задаёт только интервал шага,
+        # отрисовка идёт с частотой RENDER_FPS. Если кадр не успевает, догоняется
+        # не больше MAX_TICKS_PER_FRAME шагов, остальное отставание отбрасывается.
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        while self.running:
+            if self.paused:
+                events = pygame.event.get()
+                for event in events:
+                    size = window_resized(event)
+                    if size is not None:
+                        self.resize(*size)
+                action = self.pause_menu.handle_events(events)
+                if action == "resume":
+                    self.paused = False
+                elif action == "menu":
+                    return "menu"
+
+                self.pause_menu.render(screen)
+                pygame.display.flip()
+                self.full_redraw = True
+                self.clock.tick(10)
+                previous_time = time.perf_counter()
+                continue
+
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            self.handle_events()
+            if profiler is not None:
+                profiler.lap("handle_events")
+
+            current_time = time.perf_counter()
+            accumulator += current_time - previous_time
+            previous_time = current_time
+
+            ticks = 0
+            while self.running and accumulator >= self.engine.tick_interval:
+                if ticks == MAX_TICKS_PER_FRAME:
+                    accumulator = 0.0
+                    break
+                accumulator -= self.engine.tick_interval
+                self.update()
+                ticks += 1
+
+            if ticks or self.interpolate or self.full_redraw or self.show_profiler:
+                alpha = min(accumulator / self.engine.tick_interval, 1.0)
+                if profiler is not None:
+                    profiler.mark()
+                if self.show_profiler:
+                    # Оверлей перекрывает клетки, поэтому кадр перерисовывается целиком
+                    self.full_redraw = True
+                dirty_rects = self.render(screen, alpha)
+                if self.show_profiler and self.profiler is not None:
+                    self.render_profiler(screen)
+                if profiler is not None:
+                    profiler.lap("render")
+                self.present(dirty_rects)
+                if profiler is not None:
+                    profiler.lap("flip")
+            if profiler is not None:
+                profiler.end_frame()
+            self.clock.tick(RENDER_FPS)
+
+    def save_session(self):
+        if self.profile_trace is not None and self.profiler is not None:
+            self.profiler.export(self.profile_trace)
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+            print(f"Replay saved to {self.record_path}")
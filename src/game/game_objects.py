@@ -1,7 +1,7 @@
-import random
-import time
 import pygame
+from src.game.assets import load_image
 from config.const import (
+    BONUS_SETTINGS,
     FOOD_IMAGE,
     INVERTED_CONTROLS_IMAGE,
     DOUBLE_POINTS_IMAGE,
@@ -12,92 +12,69 @@ from config.const import (
 )
 
 
+# Спрайт бонуса, отображающий объект Bonus из движка
 class GameObject(pygame.sprite.Sprite):
-    def __init__(self, cell_size, screen_width, screen_height, max_count, lifetime, spawn_interval, color):
+    kind = None
+    image_path = None
+
+    def __init__(self, cell_size, bonus):
         super().__init__()
+        settings = BONUS_SETTINGS[self.kind]
         self.cell_size = cell_size
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.max_count = max_count
-        self.lifetime = lifetime
-        self.spawn_interval = spawn_interval
-        self.spawn_time = time.time()
-
-        self.image = pygame.Surface((cell_size, cell_size))
-        self.image.fill(color)
-
-        self.rect = self.image.get_rect()
-        self.spawn([])
-
-    def spawn(self, snake_body):
-        while True:
-            x = random.randint(
-                0, (self.screen_width // self.cell_size) - 1) * self.cell_size
-            y = random.randint(
-                0, (self.screen_height // self.cell_size) - 1) * self.cell_size
-            if (x, y) not in snake_body:
-                self.rect.topleft = (x, y)
-                break
+        self.bonus = bonus
+        self.max_count = settings["max_count"]
+        self.lifetime = settings["lifetime"]
+        self.spawn_interval = settings["spawn_interval"]
+        self.spawn_time = bonus.spawn_time
+
+        self.image = load_image(self.image_path, (cell_size, cell_size))
+        self.rect = self.image.get_rect(
+            topleft=(bonus.cell[0] * cell_size, bonus.cell[1] * cell_size))
 
 
 # Еда стандартная, увелечение змейки, макс. увелечение очков
 class Food(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height,
-                         max_count=10, lifetime=60, spawn_interval=5, color=(255, 0, 0))
-        self.image = pygame.image.load(FOOD_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "food"
+    image_path = FOOD_IMAGE
 
 
 # Яд, уменьшение змейки, макс. уменьшие очков
 class PoisonedFood(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height, max_count=5,
-                         lifetime=15, spawn_interval=10, color=(128, 0, 128))
-        self.image = pygame.image.load(POISONED_FOOD_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "poisoned_food"
+    image_path = POISONED_FOOD_IMAGE
 
 
 # Бомба - сразу завершает игру
 class Bomb(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height, max_count=3,
-                         lifetime=30, spawn_interval=15, color=(255, 255, 0))
-        self.image = pygame.image.load(BOMB_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "bomb"
+    image_path = BOMB_IMAGE
 
 
 # Ускорение змейки
 class Speedup(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height,
-                         max_count=3, lifetime=15, spawn_interval=20, color=(0, 0, 255))
-        self.image = pygame.image.load(SPEEDUP_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "speedup"
+    image_path = SPEEDUP_IMAGE
 
 
 # Замедление змейки
 class Clock(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height, max_count=1,
-                         lifetime=15, spawn_interval=25, color=(0, 255, 255))
-        self.image = pygame.image.load(CLOCK_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "clock"
+    image_path = CLOCK_IMAGE
 
 
 # Удвоение ПОЛУЧАЕМЫХ очков
 class DoublePoints(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height, max_count=1,
-                         lifetime=60, spawn_interval=30, color=(255, 165, 0))
-        self.image = pygame.image.load(DOUBLE_POINTS_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "double_points"
+    image_path = DOUBLE_POINTS_IMAGE
 
 
 # Инвертирование управления
 class InvertedControls(GameObject):
-    def __init__(self, cell_size, screen_width, screen_height):
-        super().__init__(cell_size, screen_width, screen_height, max_count=1,
-                         lifetime=15, spawn_interval=35, color=(255, 20, 147))
-        self.image = pygame.image.load(INVERTED_CONTROLS_IMAGE).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (cell_size, cell_size))
+    kind = "inverted_controls"
+    image_path = INVERTED_CONTROLS_IMAGE
+
+
+BONUS_SPRITES = {
+    bonus_class.kind: bonus_class
+    for bonus_class in (Food, PoisonedFood, Bomb, Speedup, Clock, DoublePoints, InvertedControls)
+}
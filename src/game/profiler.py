@@ -0,0 +1,106 @@
+import csv
+import json
+import time
+from collections import deque
+from config.const import PROFILER_HISTORY
+
+SECTIONS = ("handle_events", "move", "spawn", "expiry", "collisions", "effects",
+            "sync_sprites", "render", "flip")
+
+
+# Замеры времени по кадрам. Код игры вызывает lap(name) после каждого участка:
+# время с предыдущей отметки записывается на этот участок. Когда профилировщик
+# не подключён (None), остаётся только проверка атрибута.
+class FrameProfiler:
+    def __init__(self, history=PROFILER_HISTORY, keep_trace=False):
+        self.frames = deque(maxlen=history)
+        self.current = None
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.session_start = time.perf_counter()
+        self.trace = [] if keep_trace else None
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self):
+        self.last_mark = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        duration = now - self.last_mark
+        if self.current is not None:
+            self.current[name] = self.current.get(name, 0.0) + duration
+        if self.trace is not None:
+            self.trace.append((name, self.last_mark - self.session_start, duration))
+        self.last_mark = now
+
+    def end_frame(self):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current["frame"] = now - self.frame_start
+        if self.trace is not None:
+            self.trace.append(("frame", self.frame_start - self.session_start, now - self.frame_start))
+        self.frames.append(self.current)
+        self.current = None
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        values = sorted(frame.get(name, 0.0) for frame in self.frames)
+        if not values:
+            return [0.0] * len(points)
+        return [values[min(len(values) - 1, len(values) * point // 100)] for point in points]
+
+    def summary(self):
+        # Строки для оверлея: участок, p50/p95/p99 в миллисекундах
+        return [(name, [value * 1000 for value in self.percentiles(name)]) for name in SECTIONS + ("frame",)]
+
+    def export(self, path):
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+    def export_chrome_trace(self, path):
+        # Формат trace-event для chrome://tracing и Perfetto
+        events = [{"name": name, "ph": "X", "pid": 1, "tid": 2 if name == "frame" else 1,
+                   "ts": round(start * 1e6, 3), "dur": round(duration * 1e6, 3)}
+                  for name, start, duration in self.trace or ()]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def export_csv(self, path):
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file, delimiter=";")
+            writer.writerow(["section", "start_s", "duration_ms"])
+            for name, start, duration in self.trace or ():
+                writer.writerow([name, f"{start:.6f}", f"{duration * 1000:.4f}"])
+
+
+# Этапы запуска: время каждого этапа и с начала запуска. Фоновые загрузки отмечаются
+# из своих потоков; после первого кадра меню их строки печатаются сразу по готовности.
+class StartupProfiler:
+    def __init__(self, start):
+        self.start = start
+        self.last_mark = start
+        self.marks = []
+        self.reported = False
+
+    def mark(self, name, began=None):
+        # Этап основного потока длится с прошлой отметки, фоновый - с переданного began
+        now = time.perf_counter()
+        duration = now - (self.last_mark if began is None else began)
+        if began is None:
+            self.last_mark = now
+        self.marks.append((name, duration, now - self.start))
+        if self.reported:
+            self.print_mark(name, duration, now - self.start)
+
+    def print_mark(self, name, duration, total):
+        print(f"startup: {name:<16} {duration * 1000:8.1f}ms  at {total * 1000:8.1f}ms")
+
+    def report(self):
+        for mark in self.marks:
+            self.print_mark(*mark)
+        self.reported = True
@@ -1,179 +1,257 @@
 import pygame
+from collections import deque
 from config.const import SNAKE_IMAGES
+from src.game.assets import load_image
+from src.engine.grid import DIRECTION_OFFSETS
+from src.engine.snake_model import OPPOSITE_DIRECTIONS
 
+HEAD_IMAGES = {
+    "UP": "head_up",
+    "DOWN": "head_down",
+    "LEFT": "head_left",
+    "RIGHT": "head_right",
+}
 
+# Хвост смотрит от предыдущего сегмента к хвосту
+TAIL_IMAGES = {
+    "UP": "tail_up",
+    "DOWN": "tail_down",
+    "LEFT": "tail_left",
+    "RIGHT": "tail_right",
+}
+
+# Тайл тела по направлениям к соседям (к предыдущему и к следующему сегменту).
+# None - сосед в той же клетке (хвост сразу после роста).
+BODY_IMAGES = {}
+for first, second, image_key in (("UP", "DOWN", "body_vertical"),
+                                 ("LEFT", "RIGHT", "body_horizontal"),
+                                 ("UP", "LEFT", "body_topleft"),
+                                 ("UP", "RIGHT", "body_topright"),
+                                 ("DOWN", "LEFT", "body_bottomleft"),
+                                 ("DOWN", "RIGHT", "body_bottomright")):
+    BODY_IMAGES[(first, second)] = image_key
+    BODY_IMAGES[(second, first)] = image_key
+for direction in ("UP", "DOWN"):
+    BODY_IMAGES[(direction, None)] = BODY_IMAGES[(None, direction)] = "body_vertical"
+for direction in ("LEFT", "RIGHT"):
+    BODY_IMAGES[(direction, None)] = BODY_IMAGES[(None, direction)] = "body_horizontal"
+BODY_IMAGES[(None, None)] = "body_vertical"
+
+
+class SegmentSprite(pygame.sprite.Sprite):
+    def __init__(self, image, index, topleft, owner):
+        super().__init__()
+        self.image = image
+        self.index = index
+        self.owner = owner
+        self.rect = image.get_rect(topleft=topleft)
+
+
+# Отрисовка змейки поверх SnakeModel из движка.
+# Спрайты сегментов живут в deque параллельно model.segments и за ход
+# обновляются только голова, шея и хвост. Несколько змеек на одном поле
+# передают общие cell_sprites и dirty_cells, tint окрашивает спрайты.
 class Snake(pygame.sprite.Sprite):
-    def __init__(self, cell_size, screen_width, screen_height):
+    def __init__(self, cell_size, model, tint=None, cell_sprites=None, dirty_cells=None):
         super().__init__()
         self.cell_size = cell_size
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.body = [(100, 100), (80, 100), (60, 100)]
-        self.direction = "RIGHT"
-        self.next_direction = "RIGHT"
-        self.inverted_controls = False
-
-        self.images = {key: pygame.image.load(path).convert_alpha()
-                       for key, path in SNAKE_IMAGES.items()}
-        for key in self.images:
-            self.images[key] = pygame.transform.scale(
-                self.images[key], (cell_size, cell_size))
+        self.model = model
+        self.tint = tint
+        self.username = "Player"
+        self.images = self.load_images()
 
         self.image = self.images["head_right"]
-        self.rect = self.image.get_rect(topleft=self.body[0])
+        self.rect = self.image.get_rect(topleft=self.to_pixels(self.model.head_index))
 
         self.body_sprites = pygame.sprite.Group()
-        self.update_sprites()
+        self.segment_sprites = deque()
+        self.cell_sprites = cell_sprites if cell_sprites is not None else {}
+        self.dirty_cells = dirty_cells if dirty_cells is not None else set()
+        self.synced_moves = 0
+        self.previous_head = None
+        self.previous_tail = None
+        self.rebuild_sprites()
+
+    def load_images(self):
+        return {key: load_image(path, (self.cell_size, self.cell_size), tint=self.tint)
+                for key, path in SNAKE_IMAGES.items()}
+
+    def set_cell_size(self, cell_size):
+        self.cell_size = cell_size
+        self.images = self.load_images()
+        self.rebuild_sprites()
+
+    @property
+    def body(self):
+        return self.model.body
+
+    @property
+    def direction(self):
+        return self.model.direction
+
+    @property
+    def inverted_controls(self):
+        return self.model.inverted_controls
+
+    def to_pixels(self, index):
+        col, row = self.model.grid.cell(index)
+        return col * self.cell_size, row * self.cell_size
+
+    def rebuild_sprites(self):
+        self.remove_sprites()
+        for i, index in enumerate(self.model.segments):
+            self.segment_sprites.append(self.add_sprite(index, self.get_segment_image(i)))
+
+        self.synced_moves = self.model.moves
+        self.update_head()
 
     def update_sprites(self):
+        segments = self.model.segments
+        sprites = self.segment_sprites
+        new_heads = self.model.moves - self.synced_moves
+        if sprites:
+            self.previous_head = sprites[0].index
+            self.previous_tail = sprites[-1].index
+        if new_heads > len(segments) or not sprites:
+            self.rebuild_sprites()
+            return
+        self.synced_moves = self.model.moves
+
+        # Лишние сегменты с хвоста переиспользуются как новые головы
+        spare = []
+        while sprites and len(sprites) + new_heads > len(segments):
+            spare.append(sprites.pop())
+        for i in range(new_heads - 1, -1, -1):
+            if spare:
+                sprite = spare.pop()
+                self.place_sprite(sprite, segments[i])
+            else:
+                sprite = self.add_sprite(segments[i], self.images["head_right"])
+            sprites.appendleft(sprite)
+        for sprite in spare:
+            self.remove_sprite(sprite)
+        while len(sprites) < len(segments):
+            sprites.append(self.add_sprite(segments[len(sprites)], self.images["head_right"]))
+
+        # Хвост мог сместиться из-за роста или яда
+        tail_region = min(len(sprites), 2 * new_heads + 2)
+        for i in range(len(sprites) - tail_region, len(sprites)):
+            if sprites[i].index != segments[i]:
+                self.place_sprite(sprites[i], segments[i])
+
+        for i in range(min(new_heads + 1, len(sprites))):
+            self.set_image(sprites[i], self.get_segment_image(i))
+        for i in range(len(sprites) - tail_region, len(sprites)):
+            self.set_image(sprites[i], self.get_segment_image(i))
+
+        self.update_head()
+
+    def remove_sprites(self):
+        for sprite in self.segment_sprites:
+            self.unregister_sprite(sprite)
         self.body_sprites.empty()
-        for i, segment in enumerate(self.body):
-            segment_sprite = pygame.sprite.Sprite()
-            segment_sprite.image = self.get_segment_image(i)
-            segment_sprite.rect = segment_sprite.image.get_rect(
-                topleft=segment)
-            self.body_sprites.add(segment_sprite)
+        self.segment_sprites.clear()
+
+    # Все изменения спрайтов отмечаются в dirty_cells для частичной перерисовки,
+    # cell_sprites хранит спрайты сегментов в каждой клетке
+    def add_sprite(self, index, image):
+        sprite = SegmentSprite(image, index, self.to_pixels(index), self)
+        self.body_sprites.add(sprite)
+        self.cell_sprites.setdefault(index, []).append(sprite)
+        self.dirty_cells.add(index)
+        return sprite
+
+    def remove_sprite(self, sprite):
+        sprite.kill()
+        self.unregister_sprite(sprite)
+
+    def unregister_sprite(self, sprite):
+        in_cell = self.cell_sprites.get(sprite.index)
+        if in_cell is not None:
+            in_cell.remove(sprite)
+            if not in_cell:
+                del self.cell_sprites[sprite.index]
+        self.dirty_cells.add(sprite.index)
+
+    def place_sprite(self, sprite, index):
+        self.unregister_sprite(sprite)
+        sprite.index = index
+        sprite.rect.topleft = self.to_pixels(index)
+        self.cell_sprites.setdefault(index, []).append(sprite)
+        self.dirty_cells.add(index)
 
-        self.image = self.get_segment_image(0)
-        self.rect.topleft = self.body[0]
+    def set_image(self, sprite, image):
+        if sprite.image is not image:
+            sprite.image = image
+            self.dirty_cells.add(sprite.index)
+
+    def interpolated_rect(self, sprite, alpha):
+        # Голова и хвост рисуются между прошлой и текущей клеткой
+        if sprite is self.segment_sprites[0]:
+            previous = self.previous_head
+        elif sprite is self.segment_sprites[-1]:
+            previous = self.previous_tail
+        else:
+            return sprite.rect
+
+        direction = None
+        if previous is not None:
+            direction = self.model.grid.direction_between(previous, sprite.index)
+        if direction is None:
+            return sprite.rect
+
+        dx, dy = DIRECTION_OFFSETS[direction]
+        shift = round((1 - alpha) * self.cell_size)
+        return sprite.rect.move(-dx * shift, -dy * shift)
+
+    def update_head(self):
+        self.image = self.segment_sprites[0].image
+        self.rect.topleft = self.segment_sprites[0].rect.topleft
 
     def get_segment_image(self, index):
+        segments = self.model.segments
         if index == 0:
-            if self.direction == "UP":
-                return self.images["head_up"]
-            elif self.direction == "DOWN":
-                return self.images["head_down"]
-            elif self.direction == "LEFT":
-                return self.images["head_left"]
-            elif self.direction == "RIGHT":
-                return self.images["head_right"]
-        elif index == len(self.body) - 1:
-            tail_direction = self.get_tail_direction()
-            return self.images[f"tail_{tail_direction}"]
+            return self.images[HEAD_IMAGES[self.direction]]
+        elif index == len(segments) - 1:
+            return self.images[TAIL_IMAGES[self.get_tail_direction()]]
         else:
-            prev_segment = self.body[index - 1]
-            next_segment = self.body[index + 1]
-            return self.get_body_image(prev_segment, segment=self.body[index], next_segment=next_segment)
+            direction_between = self.model.grid.direction_between
+            segment = segments[index]
+            image_key = BODY_IMAGES.get(
+                (direction_between(segment, segments[index - 1]), direction_between(segment, segments[index + 1])),
+                "body_horizontal")
+            return self.images[image_key]
 
     def get_tail_direction(self):
-        if len(self.body) < 2:
+        segments = self.model.segments
+        if len(segments) < 2:
             raise ValueError(
                 "Недостаточно сегментов для определения направления хвоста")
 
-        tail = self.body[-1]
-        before_tail = self.body[-2]
-
-        if tail == before_tail:
-            if self.direction == "UP":
-                return "down"
-            elif self.direction == "DOWN":
-                return "up"
-            elif self.direction == "LEFT":
-                return "right"
-            elif self.direction == "RIGHT":
-                return "left"
-
-        if tail[0] < before_tail[0]:
-            return "left"
-        elif tail[0] > before_tail[0]:
-            return "right"
-        elif tail[1] < before_tail[1]:
-            return "up"
-        elif tail[1] > before_tail[1]:
-            return "down"
-
-        raise ValueError(
-            f"Не удалось определить направление хвоста: tail={tail}, before_tail={before_tail}")
-
-    def get_body_image(self, prev_segment, segment, next_segment):
-        def normalize_diff(a, b, max_val):
-            diff = a - b
-            if abs(diff) > max_val / 2:
-                if diff > 0:
-                    diff -= max_val
-                else:
-                    diff += max_val
-
-            return diff
-
-        dx_prev = normalize_diff(
-            segment[0], prev_segment[0], self.screen_width)
-        dy_prev = normalize_diff(
-            segment[1], prev_segment[1], self.screen_height)
-        dx_next = normalize_diff(
-            segment[0], next_segment[0], self.screen_width)
-        dy_next = normalize_diff(
-            segment[1], next_segment[1], self.screen_height)
-
-        if dx_prev == 0 and dx_next == 0:
-            return self.images["body_vertical"]
-        elif dy_prev == 0 and dy_next == 0:
-            return self.images["body_horizontal"]
-        else:
-            if (dx_prev > 0 and dy_next > 0) or (dx_next > 0 and dy_prev > 0):
-                return self.images["body_topleft"]
-            elif (dx_prev < 0 and dy_next > 0) or (dx_next < 0 and dy_prev > 0):
-                return self.images["body_topright"]
-            elif (dx_prev > 0 and dy_next < 0) or (dx_next > 0 and dy_prev < 0):
-                return self.images["body_bottomleft"]
-            elif (dx_prev < 0 and dy_next < 0) or (dx_next < 0 and dy_prev < 0):
-                return self.images["body_bottomright"]
+        direction = self.model.grid.direction_between(segments[-2], segments[-1])
+        if direction is None:
+            return OPPOSITE_DIRECTIONS[self.direction]
+        return direction
 
     def change_direction(self, direction):
-        if self.inverted_controls:
-            if direction == "UP":
-                direction = "DOWN"
-            elif direction == "DOWN":
-                direction = "UP"
-            elif direction == "LEFT":
-                direction = "RIGHT"
-            elif direction == "RIGHT":
-                direction = "LEFT"
-
-        if (direction == "UP" and self.direction != "DOWN") or \
-                (direction == "DOWN" and self.direction != "UP") or \
-                (direction == "LEFT" and self.direction != "RIGHT") or \
-                (direction == "RIGHT" and self.direction != "LEFT"):
-            self.next_direction = direction
+        self.model.change_direction(direction)
 
     def move(self, border_mode):
-        self.direction = self.next_direction
-
-        head_x, head_y = self.body[0]
-        if self.direction == "UP":
-            head_y -= self.cell_size
-        elif self.direction == "DOWN":
-            head_y += self.cell_size
-        elif self.direction == "LEFT":
-            head_x -= self.cell_size
-        elif self.direction == "RIGHT":
-            head_x += self.cell_size
-
-        if border_mode:
-            if head_x < 0 or head_x >= self.screen_width or head_y < 0 or head_y >= self.screen_height:
-                return False
-        else:
-            head_x %= self.screen_width
-            head_y %= self.screen_height
-
-        self.body.insert(0, (head_x, head_y))
-        self.body.pop()
+        if not self.model.move(border_mode):
+            return False
 
         self.update_sprites()
         return True
 
     def grow(self):
-        self.body.append(self.body[-1])
+        self.model.grow()
         self.update_sprites()
 
     def check_collision_with_food(self, food_group):
         return pygame.sprite.spritecollide(self, food_group, dokill=True)
 
     def check_self_collision(self):
-        for segment_pos in self.body[1:]:
-            if self.body[0] == segment_pos:
-                return True
-        return False
+        return self.model.check_self_collision()
 
     def check_wall_collision(self):
-        return not (0 <= self.rect.left < self.screen_width and 0 <= self.rect.top < self.screen_height)
+        return not (0 <= self.model.head[0] < self.model.cols and 0 <= self.model.head[1] < self.model.rows)
@@ -0,0 +1,48 @@
+import threading
+import time
+import pygame
+
+# Музыка запускается в фоновом потоке: открытие аудиоустройства и загрузка mp3
+# не задерживают первый кадр меню. Включение и выключение звука до готовности
+# запоминается и применяется сразу после запуска.
+_lock = threading.Lock()
+_enabled = True
+_ready = False
+
+
+def start_soundtrack(path, enabled, on_ready=None):
+    global _enabled
+    _enabled = enabled
+    thread = threading.Thread(target=_load_soundtrack, args=(path, on_ready), daemon=True)
+    thread.start()
+    return thread
+
+
+def _load_soundtrack(path, on_ready):
+    global _ready
+    began = time.perf_counter()
+    try:
+        pygame.mixer.init()
+        pygame.mixer.music.load(path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Error while loading soundtrack: {e}")
+        return
+    with _lock:
+        pygame.mixer.music.play(-1)
+        if not _enabled:
+            pygame.mixer.music.pause()
+        _ready = True
+    if on_ready is not None:
+        on_ready(began)
+
+
+def set_enabled(enabled):
+    global _enabled
+    with _lock:
+        _enabled = enabled
+        if not _ready:
+            return
+        if enabled:
+            pygame.mixer.music.unpause()
+        else:
+            pygame.mixer.music.pause()
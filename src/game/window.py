@@ -0,0 +1,32 @@
+import pygame
+from config.const import WINDOW_SIZE
+
+# Размер окна до перехода в полноэкранный режим, чтобы вернуться к нему по F11
+_windowed_size = WINDOW_SIZE
+
+
+def create_window(size=WINDOW_SIZE, fullscreen=False):
+    if fullscreen:
+        return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    return pygame.display.set_mode(size, pygame.RESIZABLE)
+
+
+def toggle_fullscreen():
+    global _windowed_size
+    screen = pygame.display.get_surface()
+    if screen.get_flags() & pygame.FULLSCREEN:
+        screen = create_window(_windowed_size)
+    else:
+        _windowed_size = screen.get_size()
+        screen = create_window(fullscreen=True)
+    return screen.get_size()
+
+
+# Новый размер окна, если событие его изменило, иначе None.
+# F11 переключает полноэкранный режим.
+def window_resized(event):
+    if event.type == pygame.VIDEORESIZE:
+        return event.w, event.h
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+        return toggle_fullscreen()
+    return None
@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+from config.const import SERVER_HOST, SERVER_PORT
+from src.engine.bots import DIRECTIONS
+from src.net.protocol import encode, decode, BoardState
+from src.net.server import TickStats
+
+
+# Один клиент нагрузки: входит в комнату, иногда поворачивает, собирает копию поля
+# из изменений и записывает промежутки между сообщениями сервера
+class LoadClient:
+    def __init__(self, host, port, room, turn_chance, seed):
+        self.host = host
+        self.port = port
+        self.room = room
+        self.turn_chance = turn_chance
+        self.rng = random.Random(seed)
+        self.board = None
+        self.deltas = 0
+        self.bytes_received = 0
+        self.gaps = []
+        self.errors = 0
+
+    async def run(self, duration):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(encode({"type": "join", "room": self.room}))
+        deadline = time.perf_counter() + duration
+        last_delta = None
+        try:
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    line = await asyncio.wait_for(reader.readline(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                self.bytes_received += len(line)
+                message = decode(line)
+                kind = message["type"]
+                if kind == "state":
+                    self.board = BoardState(message)
+                    last_delta = None
+                elif kind == "delta" and self.board is not None:
+                    now = time.perf_counter()
+                    if last_delta is not None:
+                        self.gaps.append(now - last_delta)
+                    last_delta = now
+                    self.board.apply(message)
+                    self.deltas += 1
+                    if self.rng.random() < self.turn_chance:
+                        writer.write(encode({"type": "turn", "direction": self.rng.choice(DIRECTIONS)}))
+                elif kind == "error":
+                    print(f"Server error: {message['message']}")
+                    self.errors += 1
+                    break
+        finally:
+            writer.close()
+
+
+async def request_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"type": "stats"}))
+    message = decode(await reader.readline())
+    writer.close()
+    return message
+
+
+async def run_load(args):
+    clients = [LoadClient(args.host, args.port, f"load-{i // args.clients_per_room}", args.turn_chance, i)
+               for i in range(args.rooms * args.clients_per_room)]
+    tasks = [asyncio.create_task(client.run(args.duration)) for client in clients]
+    # Статистика сервера сбрасывается после прогрева и снимается перед концом прогона
+    await asyncio.sleep(min(args.warmup, args.duration / 2))
+    await request_stats(args.host, args.port)
+    await asyncio.sleep(max(args.duration - args.warmup - 1, 0.5))
+    server_stats = await request_stats(args.host, args.port)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failures = [result for result in results if isinstance(result, Exception)]
+    return clients, server_stats, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the room server")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--clients-per-room", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds excluded from server stats")
+    parser.add_argument("--turn-chance", type=float, default=0.2, help="chance to turn after each update")
+    parser.add_argument("--spawn-server", action="store_true", help="start a server process for the run")
+    parser.add_argument("--bot", choices=("greedy", "autopilot"), default="greedy",
+                        help="bots for free slots of the spawned server")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn_server:
+        server = subprocess.Popen([sys.executable, "-m", "src.net.server", "--host", args.host,
+                                   "--port", str(args.port), "--slots", str(max(args.clients_per_room, 1)),
+                                   "--stats-interval", "0", "--bot", args.bot])
+        time.sleep(1.0)
+    try:
+        clients, stats, failures = asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    deltas = sum(client.deltas for client in clients)
+    received = sum(client.bytes_received for client in clients)
+    gaps = [gap for client in clients for gap in client.gaps]
+    print(f"clients {len(clients)} in {args.rooms} rooms, {len(failures)} failed to connect, "
+          f"{sum(client.errors for client in clients)} errors")
+    print(f"received {deltas / args.duration:.0f} updates/s, {received / 1024 / args.duration:.1f} KB/s, "
+          f"{received / max(deltas, 1):.0f} bytes per update")
+    print(f"update interval p50 {TickStats.percentile(gaps, 50) * 1000:.1f}ms "
+          f"p99 {TickStats.percentile(gaps, 99) * 1000:.1f}ms")
+    print(f"server: {stats['ticks_per_s']:.0f} ticks/s, tick p50 {stats['tick_ms_p50']:.3f}ms "
+          f"p99 {stats['tick_ms_p99']:.3f}ms, late p99 {stats['late_ms_p99']:.2f}ms, cpu {stats['cpu_load']:.0%}")
+    if stats["cpu_load"] > 0:
+        # Оценка при линейном росте нагрузки: сколько таких комнат выдержит одно ядро
+        print(f"~{stats['rooms'] / stats['cpu_load']:.0f} rooms per core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import json
+from collections import deque
+from src.engine.game_engine import BONUS_KINDS
+
+# Сообщения - JSON по одному в строке. Полное состояние отправляется при входе в комнату
+# и в начале раунда, дальше каждый шаг - только изменения:
+#   s  - [номер, [новые головы от старой к новой], длина] для сдвинувшихся змеек,
+#   b- / b+ - убранные клетки бонусов и новые [клетка, вид],
+#   sc - [номер, очки] для изменившихся очков, d - номера погибших змеек.
+KIND_IDS = {kind: i for i, kind in enumerate(BONUS_KINDS)}
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line):
+    return json.loads(line)
+
+
+def snapshot(engine, round_number):
+    return {
+        "type": "state",
+        "round": round_number,
+        "tick": engine.ticks,
+        "cols": engine.cols,
+        "rows": engine.rows,
+        "border_mode": engine.border_mode,
+        "snakes": [{"n": player.number, "body": list(player.snake.segments),
+                    "alive": player.alive, "score": player.score}
+                   for player in engine.players],
+        "bonuses": [[index, KIND_IDS[bonus.kind]] for index, bonus in engine.bonuses.items()],
+    }
+
+
+# Помнит, что уже отправлено клиентам, и собирает изменения после очередного шага движка.
+# За шаг змейка ходит не больше раза, поэтому голов в изменении не больше одной.
+class DeltaTracker:
+    def __init__(self, engine):
+        self.engine = engine
+        self.moves = [player.snake.moves for player in engine.players]
+        self.lengths = [len(player.snake) for player in engine.players]
+        self.scores = [player.score for player in engine.players]
+
+    def delta(self):
+        engine = self.engine
+        message = {"type": "delta", "tick": engine.ticks}
+
+        snakes = []
+        scores = []
+        for player in engine.players:
+            number = player.number
+            snake = player.snake
+            new_heads = snake.moves - self.moves[number]
+            length = len(snake)
+            if new_heads or length != self.lengths[number]:
+                segments = snake.segments
+                snakes.append([number, [segments[i] for i in range(min(new_heads, length) - 1, -1, -1)], length])
+                self.moves[number] = snake.moves
+                self.lengths[number] = length
+            if player.score != self.scores[number]:
+                scores.append([number, player.score])
+                self.scores[number] = player.score
+
+        removed = []
+        added = []
+        deaths = []
+        for event, subject in engine.events:
+            if event == "spawn":
+                added.append([subject.index, KIND_IDS[subject.kind]])
+            elif event == "death":
+                deaths.append(subject.number)
+            else:
+                removed.append(subject.index)
+
+        if snakes:
+            message["s"] = snakes
+        if removed:
+            message["b-"] = removed
+        if added:
+            message["b+"] = added
+        if scores:
+            message["sc"] = scores
+        if deaths:
+            message["d"] = deaths
+        return message
+
+
+# Копия поля на стороне клиента, собираемая из полного состояния и изменений
+class BoardState:
+    def __init__(self, state):
+        self.round = state["round"]
+        self.tick = state["tick"]
+        self.cols = state["cols"]
+        self.rows = state["rows"]
+        self.snakes = {snake["n"]: deque(snake["body"]) for snake in state["snakes"]}
+        self.alive = {snake["n"]: snake["alive"] for snake in state["snakes"]}
+        self.scores = {snake["n"]: snake["score"] for snake in state["snakes"]}
+        self.bonuses = {index: BONUS_KINDS[kind] for index, kind in state["bonuses"]}
+
+    def apply(self, delta):
+        self.tick = delta["tick"]
+        for number, heads, length in delta.get("s", ()):
+            body = self.snakes[number]
+            # Каждая голова сдвигает хвост, затем рост дублирует хвост, а яд его убирает
+            for head in heads:
+                body.appendleft(head)
+                body.pop()
+            while len(body) < length:
+                body.append(body[-1])
+            while len(body) > length:
+                body.pop()
+        for index in delta.get("b-", ()):
+            self.bonuses.pop(index, None)
+        for index, kind in delta.get("b+", ()):
+            self.bonuses[index] = BONUS_KINDS[kind]
+        for number, score in delta.get("sc", ()):
+            self.scores[number] = score
+        for number in delta.get("d", ()):
+            self.alive[number] = False
@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import time
+from collections import deque
+from config.const import (
+    SERVER_HOST,
+    SERVER_PORT,
+    ROOM_SLOTS,
+    ROUND_RESTART_DELAY,
+    CLIENT_WRITE_LIMIT,
+    SERVER_STATS_INTERVAL,
+    ROOM_MAX_CATCHUP_TICKS,
+    VIEW_CELLS,
+    MAX_SNAKES
+)
+from src.engine.bots import GreedyBot, Autopilot, DIRECTIONS
+from src.engine.cli import board_size, check_board
+from src.engine.game_engine import GameEngine
+from src.engine.pathfinding import DistanceField
+from src.net.protocol import encode, decode, snapshot, DeltaTracker
+
+
+# Длительность шага комнаты и опоздание шага относительно расписания, в секундах
+class TickStats:
+    def __init__(self, history=10000):
+        self.durations = deque(maxlen=history)
+        self.lateness = deque(maxlen=history)
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    def record(self, duration, lateness):
+        self.durations.append(duration)
+        self.lateness.append(lateness)
+        self.ticks += 1
+
+    @staticmethod
+    def percentile(values, point):
+        values = sorted(values)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, len(values) * point // 100)]
+
+    def report(self, rooms, clients):
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.cpu_started
+        report = {
+            "rooms": rooms,
+            "clients": clients,
+            "ticks_per_s": self.ticks / wall if wall else 0.0,
+            "tick_ms_p50": self.percentile(self.durations, 50) * 1000,
+            "tick_ms_p99": self.percentile(self.durations, 99) * 1000,
+            "late_ms_p99": self.percentile(self.lateness, 99) * 1000,
+            "out_kb_per_s": self.bytes_sent / 1024 / wall if wall else 0.0,
+            "cpu_load": cpu / wall if wall else 0.0,
+        }
+        self.durations.clear()
+        self.lateness.clear()
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        return report
+
+
+class Client:
+    def __init__(self, writer, stats):
+        self.writer = writer
+        self.stats = stats
+        self.room = None
+        self.number = None
+
+    def send(self, data):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        # Клиент, не успевающий читать, отключается, а не копит очередь в памяти сервера
+        if transport.get_write_buffer_size() > CLIENT_WRITE_LIMIT:
+            print(f"Dropping slow client in room {self.room.name if self.room else '-'}")
+            transport.close()
+            return
+        self.writer.write(data)
+        self.stats.bytes_sent += len(data)
+
+
+# Комната - отдельная партия на движке игры. Свободные места занимают боты,
+# изменения после шага кодируются один раз и рассылаются всем клиентам комнаты.
+class Room:
+    def __init__(self, name, server):
+        self.name = name
+        self.server = server
+        self.clients = {}
+        self.round = 0
+        self.engine = None
+        self.bots = {}
+        self.field = None
+        self.tracker = None
+        self.task = None
+        self.new_round()
+
+    def new_round(self):
+        settings = self.server.settings
+        self.engine = GameEngine(settings["cols"], settings["rows"], settings["border_mode"],
+                                 snake_count=settings["slots"])
+        self.field = DistanceField(self.engine) if settings["bot"] == "autopilot" else None
+        self.bots = {number: self.make_bot(number)
+                     for number in range(settings["slots"]) if number not in self.clients}
+        self.tracker = DeltaTracker(self.engine)
+        self.round += 1
+        self.broadcast(encode(snapshot(self.engine, self.round)))
+
+    def make_bot(self, number):
+        if self.field is not None:
+            return Autopilot(self.engine, number, self.field)
+        return GreedyBot(self.engine, number)
+
+    def join(self, client):
+        for number in range(self.server.settings["slots"]):
+            if number not in self.clients:
+                self.clients[number] = client
+                self.bots.pop(number, None)
+                client.room = self
+                client.number = number
+                return number
+        return None
+
+    def leave(self, client):
+        if self.clients.get(client.number) is client:
+            del self.clients[client.number]
+            self.bots[client.number] = self.make_bot(client.number)
+
+    def turn(self, number, direction):
+        if direction in DIRECTIONS:
+            self.engine.change_direction(direction, number)
+
+    def broadcast(self, data):
+        for client in self.clients.values():
+            client.send(data)
+
+    def tick(self):
+        engine = self.engine
+        for number, bot in self.bots.items():
+            if engine.players[number].alive:
+                engine.change_direction(bot.choose(), number)
+        engine.step()
+        self.broadcast(encode(self.tracker.delta()))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stats = self.server.stats
+        next_time = loop.time()
+        while self.clients:
+            if not self.engine.running:
+                await asyncio.sleep(ROUND_RESTART_DELAY)
+                self.new_round()
+                next_time = loop.time()
+                continue
+
+            # Симулированные секунды движка идут вровень с реальными
+            next_time += self.engine.tick_interval
+            # Отставшая комната тоже уступает цикл на каждом шаге, иначе догоняющие
+            # шаги подряд задержат клиентов и другие комнаты
+            await asyncio.sleep(max(next_time - loop.time(), 0))
+            start = time.perf_counter()
+            lateness = loop.time() - next_time
+            if lateness > self.engine.tick_interval * ROOM_MAX_CATCHUP_TICKS:
+                # Слишком большое отставание не догоняется: расписание идёт от текущего момента
+                next_time = loop.time()
+            self.tick()
+            stats.record(time.perf_counter() - start, max(lateness, 0.0))
+        self.server.close_room(self)
+
+
+class Server:
+    def __init__(self, settings):
+        self.settings = settings
+        self.rooms = {}
+        self.stats = TickStats()
+
+    def client_count(self):
+        return sum(len(room.clients) for room in self.rooms.values())
+
+    def get_room(self, name):
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, self)
+            self.rooms[name] = room
+        return room
+
+    def close_room(self, room):
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    async def handle_client(self, reader, writer):
+        client = Client(writer, self.stats)
+        try:
+            async for line in reader:
+                message = decode(line)
+                if not isinstance(message, dict):
+                    continue
+                kind = message.get("type")
+                if kind == "turn" and client.room is not None:
+                    client.room.turn(client.number, message.get("direction"))
+                elif kind == "join" and client.room is None:
+                    self.join(client, str(message.get("room", "default")))
+                elif kind == "stats":
+                    client.send(encode(dict(self.stats.report(len(self.rooms), self.client_count()),
+                                            type="stats")))
+        except ConnectionError:
+            pass
+        except ValueError as e:
+            print(f"Bad message from client: {e}")
+        finally:
+            if client.room is not None:
+                client.room.leave(client)
+            writer.close()
+
+    def join(self, client, name):
+        room = self.get_room(name)
+        number = room.join(client)
+        if number is None:
+            client.send(encode({"type": "error", "message": f"room {name} is full"}))
+            return
+        client.send(encode({"type": "welcome", "room": name, "player": number}))
+        client.send(encode(snapshot(room.engine, room.round)))
+        if room.task is None:
+            room.task = asyncio.create_task(room.run())
+
+    async def print_stats(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            report = self.stats.report(len(self.rooms), self.client_count())
+            print(f"rooms {report['rooms']}, clients {report['clients']}, "
+                  f"{report['ticks_per_s']:.0f} ticks/s, tick p50 {report['tick_ms_p50']:.3f}ms "
+                  f"p99 {report['tick_ms_p99']:.3f}ms, late p99 {report['late_ms_p99']:.2f}ms, "
+                  f"out {report['out_kb_per_s']:.1f} KB/s, cpu {report['cpu_load']:.0%}")
+
+    async def serve(self, host, port, stats_interval):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Serving on {host}:{port}")
+        stats_task = asyncio.create_task(self.print_stats(stats_interval)) if stats_interval else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if stats_task is not None:
+                stats_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake room server (newline-delimited JSON over TCP)")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--board", type=board_size, default=VIEW_CELLS, metavar="COLSxROWS")
+    parser.add_argument("--slots", type=int, default=ROOM_SLOTS, help="snakes per room, free slots are bots")
+    parser.add_argument("--bot", choices=("greedy", "autopilot"), default="greedy",
+                        help="who plays the free slots")
+    parser.add_argument("--no-borders", action="store_true", help="wrap around the board edges")
+    parser.add_argument("--stats-interval", type=float, default=SERVER_STATS_INTERVAL,
+                        help="seconds between stats lines, 0 to disable")
+    args = parser.parse_args()
+    if not 1 <= args.slots <= MAX_SNAKES:
+        parser.error(f"--slots must be between 1 and {MAX_SNAKES}")
+    check_board(parser, args.board, args.slots)
+
+    settings = {"cols": args.board[0], "rows": args.board[1], "slots": args.slots,
+                "border_mode": not args.no_borders, "bot": args.bot}
+    try:
+        asyncio.run(Server(settings).serve(args.host, args.port, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
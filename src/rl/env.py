@@ -0,0 +1,121 @@
+import numpy as np
+from config.const import ENV_BOARD_SIZE, ENV_MAX_STEPS
+from src.engine.bots import DIRECTIONS
+from src.engine.game_engine import GameEngine, BONUS_KINDS
+
+try:
+    import gymnasium
+    from gymnasium import spaces
+except ImportError:
+    # Без gymnasium окружение работает так же, только без пространств и проверок gym
+    gymnasium = None
+    spaces = None
+
+# Коды клеток в наблюдении: пусто, тело, голова, затем бонусы в порядке BONUS_KINDS
+EMPTY = 0
+BODY = 1
+HEAD = 2
+BONUS_CODES = {kind: 3 + i for i, kind in enumerate(BONUS_KINDS)}
+CELL_CODES = 3 + len(BONUS_KINDS)
+DEATH_CAUSES = (None, "wall", "self", "bomb", "poison")
+
+
+def observation_space(rows, cols):
+    if spaces is None:
+        return None
+    return spaces.Box(0, CELL_CODES - 1, (rows, cols), np.uint8)
+
+
+def action_space():
+    if spaces is None:
+        return None
+    return spaces.Discrete(len(DIRECTIONS))
+
+
+# Окружение в стиле Gymnasium поверх GameEngine: действие - направление из DIRECTIONS,
+# наблюдение - коды клеток поля (rows, cols), награда - прирост очков за шаг.
+# Поле наблюдения одно на всё время жизни окружения: после шага перезаписываются
+# только клетки, которых коснулся шаг. Наружу по умолчанию отдаётся копия, как требует
+# проверка gymnasium; с reuse_observation=True возвращается сам массив без копирования.
+class SnakeEnv(gymnasium.Env if gymnasium is not None else object):
+    metadata = {"render_modes": []}
+
+    def __init__(self, cols=ENV_BOARD_SIZE[0], rows=ENV_BOARD_SIZE[1], border_mode=True,
+                 max_steps=ENV_MAX_STEPS, bonus_settings=None, reuse_observation=False):
+        self.cols = cols
+        self.rows = rows
+        self.border_mode = border_mode
+        self.max_steps = max_steps
+        self.bonus_settings = bonus_settings
+        self.reuse_observation = reuse_observation
+        self.observation_space = observation_space(rows, cols)
+        self.action_space = action_space()
+        self.engine = None
+        self.board = np.zeros(rows * cols, np.uint8)
+        self.observation = self.board.reshape(rows, cols)
+        self.tails = ()
+        self.seeds = None
+
+    def reset(self, seed=None, options=None):
+        if gymnasium is not None:
+            super().reset(seed=seed)
+            self.seeds = self.np_random
+        elif seed is not None or self.seeds is None:
+            self.seeds = np.random.default_rng(seed)
+        self.engine = GameEngine(self.cols, self.rows, self.border_mode,
+                                 seed=int(self.seeds.integers(2 ** 32)), bonus_settings=self.bonus_settings)
+        self.board[:] = EMPTY
+        self.refresh(self.engine.snake.segments)
+        self.remember_tails()
+        return self.observe(), self.info()
+
+    def step(self, action):
+        engine = self.engine
+        snake = engine.snake
+        old_head = snake.head_index
+        score = engine.score
+        engine.step(DIRECTIONS[action])
+
+        # Изменились только старая и новая голова, ушедшие хвосты и клетки бонусов
+        cells = [old_head, snake.head_index, *self.tails]
+        for event, subject in engine.events:
+            if event == "death":
+                cells.extend(subject.snake.segments)
+            else:
+                cells.append(subject.index)
+        self.refresh(cells)
+        self.remember_tails()
+
+        terminated = not engine.running
+        truncated = not terminated and engine.ticks >= self.max_steps
+        return self.observe(), float(engine.score - score), terminated, truncated, self.info()
+
+    def observe(self):
+        return self.observation if self.reuse_observation else self.observation.copy()
+
+    def remember_tails(self):
+        # За шаг хвост уходит на клетку при ходе и ещё на одну от яда
+        segments = self.engine.snake.segments
+        self.tails = (segments[-1], segments[-2]) if len(segments) > 1 else (segments[-1],)
+
+    def refresh(self, cells):
+        engine = self.engine
+        grid = engine.grid
+        board = self.board
+        head = engine.snake.head_index if engine.players[0].alive else None
+        for index in cells:
+            if grid.occupancy[index]:
+                board[index] = HEAD if index == head else BODY
+            else:
+                bonus = grid.bonus_at.get(index)
+                board[index] = EMPTY if bonus is None else BONUS_CODES[bonus.kind]
+
+    def info(self):
+        engine = self.engine
+        return {
+            "score": engine.score,
+            "length": len(engine.snake),
+            "ticks": engine.ticks,
+            "death_cause": engine.death_cause,
+            "effects": tuple(effect.value for effect, _ in engine.effects),
+        }
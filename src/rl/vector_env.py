@@ -0,0 +1,304 @@
+import numpy as np
+from config.const import GAME_SPEED, BONUS_SETTINGS, ENV_BOARD_SIZE, ENV_MAX_STEPS
+from src.engine.effects import Effect, EFFECT_DURATIONS
+from src.engine.game_engine import BONUS_KINDS
+from src.rl.env import EMPTY, BODY, HEAD, gymnasium, observation_space, action_space
+
+# Направления в порядке DIRECTIONS: UP, DOWN, LEFT, RIGHT
+OPPOSITE = np.array([1, 0, 3, 2])
+RIGHT = 3
+FOOD, POISONED_FOOD, BOMB, SPEEDUP, CLOCK, DOUBLE_POINTS, INVERTED_CONTROLS = range(len(BONUS_KINDS))
+EFFECTS = (Effect.SPEED_BOOST, Effect.SLOW_DOWN, Effect.DOUBLE_POINTS, Effect.INVERTED_CONTROLS)
+SPEED_BOOST, SLOW_DOWN, DOUBLE, INVERTED = range(len(EFFECTS))
+# Причины смерти - индексы в DEATH_CAUSES
+WALL, SELF, BOMBED, POISONED = 1, 2, 3, 4
+# Клетки перед головой, где не появляются бомбы
+BOMB_CLEARANCE = 5
+
+
+# N полей в массивах NumPy: правила GameEngine (движение, семь бонусов, эффекты, очки,
+# расписание появления и исчезновения бонусов) применяются ко всем полям сразу.
+# Тело змейки - кольцевой буфер индексов клеток, занятость и бонусы - матрицы (N, клетки).
+# Случайные числа свои (numpy), поэтому партии не совпадают с GameEngine при том же seed.
+# Закончившиеся поля сбрасываются в том же шаге; наблюдение, награды и info - одни и те же
+# массивы на всё время жизни окружения.
+class VecSnakeEnv(gymnasium.vector.VectorEnv if gymnasium is not None else object):
+    metadata = {"autoreset_mode": gymnasium.vector.AutoresetMode.SAME_STEP} if gymnasium is not None else {}
+
+    def __init__(self, num_envs, cols=ENV_BOARD_SIZE[0], rows=ENV_BOARD_SIZE[1], border_mode=True,
+                 max_steps=ENV_MAX_STEPS, bonus_settings=None):
+        if cols < 5 or rows < 1:
+            raise ValueError(f"Поле {cols}x{rows} слишком мало для змейки")
+        self.num_envs = num_envs
+        self.cols = cols
+        self.rows = rows
+        self.border_mode = border_mode
+        self.max_steps = max_steps
+        size = cols * rows
+        self.size = size
+        self.single_observation_space = observation_space(rows, cols)
+        self.single_action_space = action_space()
+        if gymnasium is not None:
+            self.observation_space = gymnasium.vector.utils.batch_space(self.single_observation_space, num_envs)
+            self.action_space = gymnasium.vector.utils.batch_space(self.single_action_space, num_envs)
+
+        settings = bonus_settings if bonus_settings is not None else BONUS_SETTINGS
+        self.spawnable = np.array([kind in settings for kind in BONUS_KINDS])
+        self.max_count = np.array([settings[kind]["max_count"] if kind in settings else 0 for kind in BONUS_KINDS])
+        self.lifetime = np.array([settings[kind]["lifetime"] if kind in settings else 0 for kind in BONUS_KINDS],
+                                 np.float64)
+        self.interval = np.array([settings[kind]["spawn_interval"] if kind in settings else 0
+                                  for kind in BONUS_KINDS], np.float64)
+        self.durations = np.array([EFFECT_DURATIONS[effect] for effect in EFFECTS], np.float64)
+
+        # Соседи клетки по направлениям: индекс или -1 за краем поля
+        cells = np.arange(size)
+        col, row = cells % cols, cells // cols
+        self.neighbours = np.empty((4, size), np.int64)
+        for direction, (dx, dy) in enumerate(((0, -1), (0, 1), (-1, 0), (1, 0))):
+            c, r = col + dx, row + dy
+            if border_mode:
+                inside = (c >= 0) & (c < cols) & (r >= 0) & (r < rows)
+                self.neighbours[direction] = np.where(inside, r * cols + c, -1)
+            else:
+                self.neighbours[direction] = (r % rows) * cols + c % cols
+        head_col, head_row = min(4, cols - 1), min(4, rows // 2)
+        self.start_body = np.array([head_row * cols + head_col - i for i in range(3)])
+
+        n = num_envs
+        self.envs = np.arange(n)
+        self.board = np.zeros((n, size), np.uint8)
+        self.observation = self.board.reshape(n, rows, cols)
+        self.occupancy = np.zeros((n, size), np.int16)
+        self.bonus = np.full((n, size), -1, np.int8)
+        self.bonus_expiry = np.full((n, size), np.inf)
+        self.next_expiry = np.full(n, np.inf)
+        self.bonus_counts = np.zeros((n, len(BONUS_KINDS)), np.int32)
+        self.spawn_due = np.zeros((n, len(BONUS_KINDS)))
+        # Хвост после роста держит копии, поэтому буфер с запасом на всё поле
+        self.capacity = 2 * size
+        self.body = np.zeros((n, self.capacity), np.int64)
+        self.head_pos = np.zeros(n, np.int64)
+        self.length = np.zeros(n, np.int64)
+        self.direction = np.zeros(n, np.int64)
+        self.inverted = np.zeros(n, bool)
+        self.time = np.zeros(n)
+        self.next_move = np.zeros(n)
+        self.speed = np.zeros(n)
+        self.multiplier = np.zeros(n, np.int64)
+        self.score = np.zeros(n, np.int64)
+        self.effect_expiry = np.full((n, len(EFFECTS)), np.inf)
+        self.ticks = np.zeros(n, np.int64)
+        self.death = np.zeros(n, np.int8)
+        self.rewards = np.zeros(n, np.float32)
+        self.terminated = np.zeros(n, bool)
+        self.truncated = np.zeros(n, bool)
+        self.final_observation = np.zeros_like(self.observation)
+        self.final_info = {"score": np.zeros(n, np.int64), "length": np.zeros(n, np.int64),
+                           "ticks": np.zeros(n, np.int64), "death": np.zeros(n, np.int8)}
+        self.rng = None
+
+    def reset(self, seed=None, options=None):
+        if gymnasium is not None:
+            super().reset(seed=seed)
+            self.rng = self.np_random
+        elif seed is not None or self.rng is None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.envs)
+        return self.observation, {"score": self.score, "length": self.length, "ticks": self.ticks}
+
+    def reset_envs(self, envs):
+        self.board[envs] = EMPTY
+        self.occupancy[envs] = 0
+        self.bonus[envs] = -1
+        self.bonus_expiry[envs] = np.inf
+        self.next_expiry[envs] = np.inf
+        self.bonus_counts[envs] = 0
+        # Первое появление каждого бонуса - на первом же шаге
+        self.spawn_due[envs] = np.where(self.spawnable, -np.inf, np.inf)
+
+        start = self.start_body
+        self.body[envs, :len(start)] = start
+        self.head_pos[envs] = 0
+        self.length[envs] = len(start)
+        self.occupancy[envs[:, None], start] = 1
+        self.board[envs[:, None], start[1:]] = BODY
+        self.board[envs, start[0]] = HEAD
+        self.direction[envs] = RIGHT
+        self.inverted[envs] = False
+        self.time[envs] = 0.0
+        self.next_move[envs] = 1 / GAME_SPEED
+        self.speed[envs] = GAME_SPEED
+        self.multiplier[envs] = 1
+        self.score[envs] = 0
+        self.effect_expiry[envs] = np.inf
+        self.ticks[envs] = 0
+
+    def segment(self, envs, position):
+        # Сегмент с номером position от головы
+        return self.body[envs, (self.head_pos[envs] + position) % self.capacity]
+
+    def step(self, actions):
+        envs = self.envs
+        occupancy = self.occupancy
+        previous_score = self.score.copy()
+        self.death[:] = 0
+
+        actions = np.asarray(actions)
+        actions = np.where(self.inverted, OPPOSITE[actions], actions)
+        np.copyto(self.direction, actions, where=actions != OPPOSITE[self.direction])
+        self.time[:] = self.next_move
+        self.ticks += 1
+
+        # Ход: хвост освобождает клетку, голова занимает новую
+        old_head = self.segment(envs, 0)
+        tail = self.segment(envs, self.length - 1)
+        old_tail = self.segment(envs, np.maximum(self.length - 2, 0))
+        new_head = self.neighbours[self.direction, old_head]
+        wall = new_head < 0
+        self.death[wall] = WALL
+        live = envs[~wall]
+        head = new_head[live]
+        occupancy[live, tail[live]] -= 1
+        self.head_pos[live] = (self.head_pos[live] - 1) % self.capacity
+        self.body[live, self.head_pos[live]] = head
+        occupancy[live, head] += 1
+        touched = [(envs, old_head), (envs, tail), (envs, old_tail), (live, head)]
+
+        touched.extend(self.expire_bonuses(live))
+        for kind in range(len(BONUS_KINDS)):
+            due = live[self.spawn_due[live, kind] < self.time[live]]
+            if len(due):
+                self.spawn_due[due, kind] = self.time[due] + self.interval[kind]
+                touched.append(self.spawn(due[self.bonus_counts[due, kind] < self.max_count[kind]], kind))
+
+        crashed = occupancy[live, head] > 1
+        self.death[live[crashed]] = SELF
+        live, head = live[~crashed], head[~crashed]
+        kinds = self.bonus[live, head]
+        eating = kinds >= 0
+        self.eat(live[eating], head[eating], kinds[eating].astype(np.int64))
+
+        if self.spawnable[FOOD]:
+            hungry = envs[(self.death == 0) & (self.bonus_counts[:, FOOD] == 0)]
+            if len(hungry):
+                touched.append(self.spawn(hungry, FOOD))
+        self.end_effects(envs[self.death == 0])
+        self.next_move[:] = self.time + 1 / self.speed
+
+        self.refresh(touched)
+        np.subtract(self.score, previous_score, out=self.rewards, casting="unsafe")
+        np.not_equal(self.death, 0, out=self.terminated)
+        np.logical_and(~self.terminated, self.ticks >= self.max_steps, out=self.truncated)
+        done = self.terminated | self.truncated
+        info = {"score": self.score, "length": self.length, "ticks": self.ticks, "death": self.death}
+        if done.any():
+            finished = envs[done]
+            self.final_observation[finished] = self.observation[finished]
+            for key, values in self.final_info.items():
+                values[finished] = info[key][finished]
+            self.reset_envs(finished)
+            info.update(final_obs=self.final_observation, _final_obs=done,
+                        final_info=self.final_info, _final_info=done)
+        return self.observation, self.rewards, self.terminated, self.truncated, info
+
+    def expire_bonuses(self, live):
+        due = live[self.next_expiry[live] <= self.time[live]]
+        if not len(due):
+            return []
+        expired = self.bonus_expiry[due] <= self.time[due, None]
+        rows, cells = np.nonzero(expired)
+        envs = due[rows]
+        np.subtract.at(self.bonus_counts, (envs, self.bonus[envs, cells]), 1)
+        self.bonus[envs, cells] = -1
+        self.bonus_expiry[envs, cells] = np.inf
+        self.next_expiry[due] = self.bonus_expiry[due].min(axis=1)
+        return [(envs, cells)]
+
+    def spawn(self, envs, kind):
+        # Случайная свободная клетка каждого поля - максимум случайных ключей по свободным клеткам
+        free = (self.occupancy[envs] == 0) & (self.bonus[envs] < 0)
+        if kind == BOMB:
+            rows = np.arange(len(envs))
+            ahead = self.segment(envs, 0)
+            for _ in range(BOMB_CLEARANCE):
+                ahead = self.neighbours[self.direction[envs[rows]], ahead]
+                # За краем поля идти дальше некуда
+                rows, ahead = rows[ahead >= 0], ahead[ahead >= 0]
+                free[rows, ahead] = False
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        cells = keys.argmax(axis=1)
+        placed = free[np.arange(len(envs)), cells]
+        envs, cells = envs[placed], cells[placed]
+        self.bonus[envs, cells] = kind
+        self.bonus_expiry[envs, cells] = self.time[envs] + self.lifetime[kind]
+        self.next_expiry[envs] = np.minimum(self.next_expiry[envs], self.bonus_expiry[envs, cells])
+        self.bonus_counts[envs, kind] += 1
+        return envs, cells
+
+    def eat(self, envs, cells, kinds):
+        self.bonus[envs, cells] = -1
+        self.bonus_expiry[envs, cells] = np.inf
+        self.bonus_counts[envs, kinds] -= 1
+        time = self.time
+        multiplier = self.multiplier
+
+        food = envs[kinds == FOOD]
+        # Рост - копия хвоста в конце тела
+        tail = self.segment(food, self.length[food] - 1)
+        self.body[food, (self.head_pos[food] + self.length[food]) % self.capacity] = tail
+        self.occupancy[food, tail] += 1
+        self.length[food] += 1
+        self.score[food] += 10 * multiplier[food]
+
+        poisoned = envs[kinds == POISONED_FOOD]
+        shrinking = poisoned[self.length[poisoned] > 1]
+        self.death[poisoned[self.length[poisoned] <= 1]] = POISONED
+        self.occupancy[shrinking, self.segment(shrinking, self.length[shrinking] - 1)] -= 1
+        self.length[shrinking] -= 1
+        broke = poisoned[self.score[poisoned] < 8]
+        self.score[poisoned] -= 8
+        self.score[broke] = 0
+        self.death[broke] = POISONED
+
+        self.death[envs[kinds == BOMB]] = BOMBED
+
+        for kind, effect, cancelled, speed in ((SPEEDUP, SPEED_BOOST, SLOW_DOWN, GAME_SPEED * 2),
+                                               (CLOCK, SLOW_DOWN, SPEED_BOOST, GAME_SPEED // 1.5)):
+            eaters = envs[kinds == kind]
+            self.effect_expiry[eaters, effect] = time[eaters] + self.durations[effect]
+            self.effect_expiry[eaters, cancelled] = np.inf
+            self.speed[eaters] = speed
+            self.score[eaters] += 3 * multiplier[eaters]
+
+        doubled = envs[kinds == DOUBLE_POINTS]
+        self.effect_expiry[doubled, DOUBLE] = time[doubled] + self.durations[DOUBLE]
+        multiplier[doubled] = 2
+        self.score[doubled] += 5 * multiplier[doubled]
+
+        inverted = envs[kinds == INVERTED_CONTROLS]
+        self.effect_expiry[inverted, INVERTED] = time[inverted] + self.durations[INVERTED]
+        self.inverted[inverted] = True
+        self.score[inverted] += 9 * multiplier[inverted]
+
+    def end_effects(self, envs):
+        ended = self.effect_expiry[envs] <= self.time[envs, None]
+        if not ended.any():
+            return
+        rows, effects = np.nonzero(ended)
+        self.effect_expiry[envs[rows], effects] = np.inf
+        self.speed[envs[ended[:, SPEED_BOOST] | ended[:, SLOW_DOWN]]] = GAME_SPEED
+        self.multiplier[envs[ended[:, DOUBLE]]] = 1
+        self.inverted[envs[ended[:, INVERTED]]] = False
+
+    def refresh(self, touched):
+        # Коды клеток, которых коснулся шаг, пересчитываются по занятости и бонусам
+        envs = np.concatenate([pair[0] for pair in touched])
+        cells = np.concatenate([pair[1] for pair in touched])
+        head = self.segment(envs, 0)
+        kinds = self.bonus[envs, cells]
+        self.board[envs, cells] = np.where(
+            self.occupancy[envs, cells] > 0,
+            np.where(cells == head, HEAD, BODY),
+            np.where(kinds >= 0, kinds + 3, EMPTY))
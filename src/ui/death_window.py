@@ -1,36 +1,33 @@
 import pygame
-import json
-from config.const import LOCALE_FILENAME
+from src.game.assets import get_font, render_text
+from config.locale_work import get_texts
 
 
 class DeathWindow:
     def __init__(self, width, height, score, language="en"):
-        self.width = width
-        self.height = height
         self.score = score
         self.language = language
         self.texts = self.load_texts()
-        self.font = pygame.font.Font(None, 50)
+        self.font = get_font(50)
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
         self.restart_button = pygame.Rect(
             width // 2 - 130, height // 2 - 60, 250, 50)
         self.menu_button = pygame.Rect(
             width // 2 - 130, height // 2 + 10, 250, 50)
 
     def load_texts(self):
-        with open(LOCALE_FILENAME, "r", encoding="utf-8") as file:
-            texts = json.load(file)
-            return texts.get(self.language, texts["en"])
+        return get_texts(self.language)
 
     def render(self, screen):
         screen.fill((0, 0, 0))
-        game_over_text = self.font.render(
-            self.texts["game_over"], True, (255, 255, 255))
-        score_text = self.font.render(
-            f"{self.texts['score_label']}: {self.score}", True, (255, 255, 255))
-        restart_text = self.font.render(
-            self.texts["buttons"]["restart"], True, (0, 0, 0))
-        menu_text = self.font.render(
-            self.texts["buttons"]["menu"], True, (0, 0, 0))
+        game_over_text = render_text(self.texts["game_over"], 50, (255, 255, 255))
+        score_text = render_text(f"{self.texts['score_label']}: {self.score}", 50, (255, 255, 255))
+        restart_text = render_text(self.texts["buttons"]["restart"], 50, (0, 0, 0))
+        menu_text = render_text(self.texts["buttons"]["menu"], 50, (0, 0, 0))
 
         screen.blit(game_over_text, (self.width // 2 -
                                      game_over_text.get_width() // 2, self.height // 2 - 200))
@@ -1,6 +1,6 @@
 import pygame
-import json
-from config.const import LOCALE_FILENAME
+from config.locale_work import get_texts
+from src.game.assets import load_image, HELP_ICON_SIZE, get_font, render_text
 from config.const import (
     FOOD_IMAGE,
     POISONED_FOOD_IMAGE,
@@ -14,29 +14,22 @@ from config.const import (
 
 class HelpWindow:
     def __init__(self, screen_width, screen_height, language="en"):
-        self.screen_width = screen_width
-        self.screen_height = screen_height
         self.language = language
         self.texts = self.load_locale()
-        self.font = pygame.font.Font(None, 40)
-        self.title_font = pygame.font.Font(None, 60)
-        self.back_button = pygame.Rect(
-            screen_width // 2 - 100, screen_height - 90, 200, 50)
+        self.font = get_font(40)
+        self.title_font = get_font(60)
         self.scroll_offset = 0
+        self.resize(screen_width, screen_height)
 
         self.images = {
-            "Food": pygame.image.load(FOOD_IMAGE).convert_alpha(),
-            "Poisoned Food": pygame.image.load(POISONED_FOOD_IMAGE).convert_alpha(),
-            "Bomb": pygame.image.load(BOMB_IMAGE).convert_alpha(),
-            "Speedup": pygame.image.load(SPEEDUP_IMAGE).convert_alpha(),
-            "Clock": pygame.image.load(CLOCK_IMAGE).convert_alpha(),
-            "Double Points": pygame.image.load(DOUBLE_POINTS_IMAGE).convert_alpha(),
-            "Inverted Controls": pygame.image.load(INVERTED_CONTROLS_IMAGE).convert_alpha(),
+            "Food": load_image(FOOD_IMAGE, HELP_ICON_SIZE),
+            "Poisoned Food": load_image(POISONED_FOOD_IMAGE, HELP_ICON_SIZE),
+            "Bomb": load_image(BOMB_IMAGE, HELP_ICON_SIZE),
+            "Speedup": load_image(SPEEDUP_IMAGE, HELP_ICON_SIZE),
+            "Clock": load_image(CLOCK_IMAGE, HELP_ICON_SIZE),
+            "Double Points": load_image(DOUBLE_POINTS_IMAGE, HELP_ICON_SIZE),
+            "Inverted Controls": load_image(INVERTED_CONTROLS_IMAGE, HELP_ICON_SIZE),
         }
-
-        for key in self.images:
-            self.images[key] = pygame.transform.scale(
-                self.images[key], (40, 40))
         self.localized_object_names = {
             "Poisoned Food": {"en": "Poisoned Food", "ru": "Яд"},
             "Food": {"en": "Food", "ru": "Еда"},
@@ -47,9 +40,14 @@ class HelpWindow:
             "Inverted Controls": {"en": "Inverted Controls", "ru": "Инверсия"},
         }
 
+    def resize(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.back_button = pygame.Rect(
+            screen_width // 2 - 100, screen_height - 90, 200, 50)
+
     def load_locale(self):
-        with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
-            return json.load(file)[self.language]
+        return get_texts(self.language)
 
     def wrap_text(self, text, font, max_width):
         words = text.split(' ')
@@ -79,8 +77,7 @@ class HelpWindow:
 
     def render(self, screen):
         screen.fill((0, 0, 0))
-        title_text = self.title_font.render(
-            self.texts["help_window"]["help_title"], True, (255, 255, 255))
+        title_text = render_text(self.texts["help_window"]["help_title"], 60, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 50))
         screen.blit(title_text, title_rect)
 
@@ -108,12 +105,10 @@ class HelpWindow:
                             wrapped_line = wrapped_line.replace(
                                 localized_name, "")
                             break
-                    line_surface = self.font.render(
-                        wrapped_line, True, (255, 255, 255))
+                    line_surface = render_text(wrapped_line, 40, (255, 255, 255))
                     screen.blit(line_surface, (110, y_offset))
                 else:
-                    line_surface = self.font.render(
-                        wrapped_line, True, (255, 255, 255))
+                    line_surface = render_text(wrapped_line, 40, (255, 255, 255))
                     screen.blit(line_surface, (60, y_offset))
                 y_offset += 50
         screen.set_clip(clip_rect)
@@ -126,8 +121,7 @@ class HelpWindow:
             pygame.draw.rect(screen, (70, 70, 70),
                              self.back_button, border_radius=5)
 
-        back_text = self.font.render(
-            self.texts["buttons"]["back"], True, (255, 255, 255))
+        back_text = render_text(self.texts["buttons"]["back"], 40, (255, 255, 255))
         back_rect = back_text.get_rect(center=self.back_button.center)
         screen.blit(back_text, back_rect)
 
@@ -1,10 +1,10 @@
 import pygame
 import sys
 import json
-import os
+from src.game.assets import get_font, render_text
+from src.game.window import window_resized
 from config.const import LOCALE_FILENAME
-from src.ui.rating_window import RatingWindow
-from src.ui.help_window import HelpWindow
+from config.locale_work import get_texts
 
 
 class MainMenu:
@@ -22,16 +22,14 @@ class MainMenu:
         self.initialize()
 
     def load_locale(self):
-        if not os.path.exists(LOCALE_FILENAME):
+        try:
+            return get_texts(self.language)
+
+        except FileNotFoundError:
             print(f"File error: {LOCALE_FILENAME} not found")
             pygame.quit()
             sys.exit(1)
 
-        try:
-            with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
-                localization_data = json.load(file)
-                return localization_data[self.language]
-
         except (json.JSONDecodeError, KeyError) as e:
             print(f"Critical error while loading localization: {e}")
             pygame.quit()
@@ -39,8 +37,8 @@ class MainMenu:
 
     def initialize(self):
         pygame.font.init()
-        self.title_font = pygame.font.Font(None, 80)
-        self.button_font = pygame.font.Font(None, 50)
+        self.title_font = get_font(80)
+        self.button_font = get_font(50)
 
         button_width = 220
         button_height = 50
@@ -89,6 +87,11 @@ class MainMenu:
             }
         ]
 
+    def resize(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.initialize()
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -99,8 +102,7 @@ class MainMenu:
 
     def render(self, screen):
         screen.fill((0, 0, 0))
-        title_text = self.title_font.render(
-            self.texts["title"], True, (255, 255, 255))
+        title_text = render_text(self.texts["title"], 80, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 100))
         screen.blit(title_text, title_rect)
 
@@ -113,8 +115,7 @@ class MainMenu:
                 pygame.draw.rect(screen, (70, 70, 70),
                                  button["rect"], border_radius=5)
 
-            text = self.button_font.render(
-                button["text"], True, (255, 255, 255))
+            text = render_text(button["text"], 50, (255, 255, 255))
             text_rect = text.get_rect(center=button["rect"].center)
             screen.blit(text, text_rect)
 
@@ -132,13 +133,19 @@ class MainMenu:
         self.open_settings_flag = True
 
     def show_help(self):
+        # Окна справки и рейтинга импортируются при открытии, а не при запуске игры
+        from src.ui.help_window import HelpWindow
         help_window = HelpWindow(self.screen_width, self.screen_height, self.language)
         running = True
 
         while running:
             events = pygame.event.get()
             for event in events:
-                if event.type == pygame.QUIT:
+                size = window_resized(event)
+                if size is not None:
+                    self.resize(*size)
+                    help_window.resize(*size)
+                elif event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
@@ -150,13 +157,18 @@ class MainMenu:
             pygame.display.flip()
 
     def show_top_players(self):
+        from src.ui.rating_window import RatingWindow
         rating_window = RatingWindow(self.screen_width, self.screen_height, self.language)
         running = True
 
         while running:
             events = pygame.event.get()
             for event in events:
-                if event.type == pygame.QUIT:
+                size = window_resized(event)
+                if size is not None:
+                    self.resize(*size)
+                    rating_window.resize(*size)
+                elif event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
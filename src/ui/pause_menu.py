@@ -1,7 +1,7 @@
 import sys
 import pygame
-import json
-from config.const import LOCALE_FILENAME
+from src.game.assets import get_font, render_text
+from config.locale_work import get_texts
 
 
 class PauseMenu:
@@ -10,14 +10,17 @@ class PauseMenu:
         self.screen_height = screen_height
         self.language = language
         self.texts = self.load_locale()
-        self.title_font = pygame.font.Font(None, 80)
-        self.button_font = pygame.font.Font(None, 50)
+        self.title_font = get_font(80)
+        self.button_font = get_font(50)
         self.buttons = self.initialize_buttons()
 
     def load_locale(self):
-        with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
-            localization_data = json.load(file)
-            return localization_data[self.language]
+        return get_texts(self.language)
+
+    def resize(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.buttons = self.initialize_buttons()
 
     def initialize_buttons(self):
         button_width = 250
@@ -54,7 +57,7 @@ class PauseMenu:
     def render(self, screen):
         screen.fill((0, 0, 0))
 
-        title_text = self.title_font.render(self.texts["pause_title"], True, (255, 255, 255))
+        title_text = render_text(self.texts["pause_title"], 80, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 50))
         screen.blit(title_text, title_rect)
 
@@ -65,6 +68,6 @@ class PauseMenu:
             else:
                 pygame.draw.rect(screen, (70, 70, 70), button["rect"], border_radius=5)
 
-            text = self.button_font.render(button["text"], True, (255, 255, 255))
+            text = render_text(button["text"], 50, (255, 255, 255))
             text_rect = text.get_rect(center=button["rect"].center)
             screen.blit(text, text_rect)
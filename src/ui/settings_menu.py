@@ -1,7 +1,11 @@
 import pygame
 import os
 import json
-from config.const import LOCALE_FILENAME, SETTINGS_FILENAME, SOUND_ICON_ON, SOUND_ICON_OFF, FLAG_ICON_EN, FLAG_ICON_RU
+from src.game.assets import load_image, get_font, render_text
+from config.locale_work import get_texts
+from config import storage_work
+from src.game import sound
+from config.const import SETTINGS_FILENAME, SOUND_ICON_ON, SOUND_ICON_OFF, FLAG_ICON_EN, FLAG_ICON_RU
 
 
 class SettingsMenu:
@@ -27,23 +31,21 @@ class SettingsMenu:
         self.initialize()
 
     def load_locale(self):
-        with open(LOCALE_FILENAME, 'r', encoding='utf-8') as file:
-            localization_data = json.load(file)
-            self.texts = localization_data[self.language]
+        self.texts = get_texts(self.language)
 
     def load_resources(self):
         self.load_locale()
-        self.sound_icon_on = pygame.image.load(SOUND_ICON_ON)
-        self.sound_icon_off = pygame.image.load(SOUND_ICON_OFF)
-        self.flag_icon_en = pygame.image.load(FLAG_ICON_EN)
-        self.flag_icon_ru = pygame.image.load(FLAG_ICON_RU)
+        self.sound_icon_on = load_image(SOUND_ICON_ON)
+        self.sound_icon_off = load_image(SOUND_ICON_OFF)
+        self.flag_icon_en = load_image(FLAG_ICON_EN)
+        self.flag_icon_ru = load_image(FLAG_ICON_RU)
 
     def initialize(self):
         self.load_resources()
 
         pygame.font.init()
-        self.title_font = pygame.font.Font(None, 80)
-        self.button_font = pygame.font.Font(None, 50)
+        self.title_font = get_font(80)
+        self.button_font = get_font(50)
 
         button_width = 140
         button_height = 50
@@ -84,7 +86,14 @@ class SettingsMenu:
             "action": self.go_back
         })
 
+    def resize(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.initialize()
+
     def load_settings(self):
+        # Прошлое сохранение могло ещё стоять в очереди фоновой записи
+        storage_work.flush()
         if os.path.exists(SETTINGS_FILENAME):
             with open(SETTINGS_FILENAME, 'r', encoding='utf-8') as file:
                 settings = json.load(file)
@@ -103,8 +112,8 @@ class SettingsMenu:
             "username": self.username,
             "border_mode": self.border_mode
         }
-        with open(SETTINGS_FILENAME, 'w', encoding='utf-8') as file:
-            json.dump(settings, file, indent=4)
+        text = json.dumps(settings, indent=4)
+        storage_work.submit("settings", lambda: storage_work.write_atomic(SETTINGS_FILENAME, text))
 
     def get_settings(self):
         return {
@@ -142,8 +151,7 @@ class SettingsMenu:
     def render(self, screen):
         screen.fill((0, 0, 0))
 
-        title_text = self.title_font.render(
-            self.texts["settings_title"], True, (255, 255, 255))
+        title_text = render_text(self.texts["settings_title"], 80, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, 100))
         screen.blit(title_text, title_rect)
 
@@ -161,8 +169,7 @@ class SettingsMenu:
                 icon_rect = icon.get_rect(center=button["rect"].center)
                 screen.blit(icon, icon_rect)
             else:
-                text = self.button_font.render(
-                    button["text"], True, (255, 255, 255))
+                text = render_text(button["text"], 50, (255, 255, 255))
                 text_rect = text.get_rect(center=button["rect"].center)
                 screen.blit(text, text_rect)
 
@@ -174,8 +181,7 @@ class SettingsMenu:
             pygame.draw.rect(screen, (70, 70, 70),
                              border_button["rect"], border_radius=5)
 
-        border_text = self.button_font.render(
-            border_button["text"], True, (255, 255, 255))
+        border_text = render_text(border_button["text"], 50, (255, 255, 255))
         border_text_rect = border_text.get_rect(
             center=border_button["rect"].center)
         screen.blit(border_text, border_text_rect)
@@ -187,7 +193,7 @@ class SettingsMenu:
         else:
             pygame.draw.rect(screen, (255, 255, 255), self.input_box, 1)
 
-        input_font = pygame.font.Font(None, 40)
+        input_font = get_font(40)
         input_text = self.input_text
 
         is_cut = False
@@ -197,7 +203,7 @@ class SettingsMenu:
         if is_cut:
             input_text += "..."
 
-        input_surface = input_font.render(input_text, True, (255, 255, 255))
+        input_surface = render_text(input_text, 40, (255, 255, 255))
         screen.blit(input_surface, (self.input_box.x +
                                     10, self.input_box.y + 10))
 
@@ -208,8 +214,7 @@ class SettingsMenu:
             pygame.draw.rect(screen, (70, 70, 70),
                              self.apply_button["rect"], border_radius=5)
 
-        apply_text = self.button_font.render(
-            self.apply_button["text"], True, (255, 255, 255))
+        apply_text = render_text(self.apply_button["text"], 50, (255, 255, 255))
         apply_text_rect = apply_text.get_rect(
             center=self.apply_button["rect"].center)
         screen.blit(apply_text, apply_text_rect)
@@ -218,10 +223,7 @@ class SettingsMenu:
         self.sound_enabled = not self.sound_enabled
         self.buttons[0]["icon"] = self.sound_icon_on if self.sound_enabled else self.sound_icon_off
         self.save_settings()
-        if self.sound_enabled:
-            pygame.mixer.music.unpause()
-        else:
-            pygame.mixer.music.pause()
+        sound.set_enabled(self.sound_enabled)
 
     def toggle_language(self):
         self.language = "ru" if self.language == "en" else "en"